@@ -10,10 +10,15 @@ from database import Base
 
 # === PASSWORD HASHING ===
 
+# PBKDF2 rounds for user passwords. Stored hashes don't record the count,
+# so changing it invalidates existing passwords (tests lower it for speed).
+PASSWORD_HASH_ITERATIONS = 100000
+
+
 def hash_password(password: str) -> str:
     """Hash a password with salt"""
     salt = secrets.token_hex(16)
-    hash_obj = hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), 100000)
+    hash_obj = hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), PASSWORD_HASH_ITERATIONS)
     return f"{salt}${hash_obj.hex()}"
 
 
@@ -21,7 +26,7 @@ def verify_password(password: str, password_hash: str) -> bool:
     """Verify a password against its hash"""
     try:
         salt, stored_hash = password_hash.split('$')
-        hash_obj = hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), 100000)
+        hash_obj = hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), PASSWORD_HASH_ITERATIONS)
         return hash_obj.hex() == stored_hash
     except:
         return False
@@ -32,6 +37,11 @@ def generate_session_token() -> str:
     return "clawcollab_session_" + secrets.token_urlsafe(32)
 
 
+def hash_session_token(token: str) -> str:
+    """Hash a session token for storage - only the hash is kept in the database"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 # === AGENT MODEL ===
 
 class Agent(Base):
@@ -42,7 +52,7 @@ class Agent(Base):
     description = Column(String, nullable=True)
 
     # Authentication
-    api_key = Column(String, unique=True, index=True, nullable=False)
+    api_key_hash = Column(String, unique=True, index=True, nullable=False)  # SHA-256 of the API key, never the key itself
     claim_token = Column(String, unique=True, index=True, nullable=True)
     verification_code = Column(String, nullable=True)
 
@@ -71,6 +81,11 @@ def generate_api_key() -> str:
     return "clawcollab_" + secrets.token_urlsafe(32)
 
 
+def hash_api_key(api_key: str) -> str:
+    """Hash an API key for storage - only the hash is kept in the database"""
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
 def generate_claim_token() -> str:
     """Generate a claim token for human verification"""
     return "clawcollab_claim_" + secrets.token_urlsafe(24)
@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+# All caches created by this module, so tests can reset them between runs
+_caches = []
+
+
+class TTLCache:
+    """Small in-process cache with per-entry expiry.
+
+    The app runs as a single uvicorn process, so an in-memory cache is shared
+    by every request. Writers should call delete() after committing so readers
+    never see stale data for longer than the TTL.
+
+    A reader filling a miss takes generation(key) before its DB read and
+    passes it to set(), so a value read before a concurrent delete() is
+    dropped instead of cached.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # Every entry gets the same TTL, so insertion order is expiry order
+        self._data = OrderedDict()
+        # Counter bumped by every delete(), and the stamp of each key's last
+        # delete. Only max_entries stamps are kept; set() treats a generation
+        # older than the last dropped stamp as stale.
+        self._generation = 0
+        self._deleted = OrderedDict()
+        self._deleted_floor = 0
+        self._lock = threading.Lock()
+        _caches.append(self)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._data[key]
+                return None
+            return value
+
+    def generation(self, key: Hashable) -> int:
+        """Return a token for the key's current state, to pass to set()"""
+        with self._lock:
+            return self._generation
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """Cache a value for ttl_seconds, unless deleted since generation"""
+        with self._lock:
+            if generation is not None and (
+                generation < self._deleted_floor or self._deleted.get(key, 0) > generation
+            ):
+                return
+            if key in self._data:
+                self._data.move_to_end(key)
+            elif len(self._data) >= self.max_entries:
+                # Evict the entry closest to expiry
+                self._data.popitem(last=False)
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def delete(self, key: Hashable) -> None:
+        """Drop a cached value"""
+        with self._lock:
+            self._data.pop(key, None)
+            self._generation += 1
+            self._deleted.pop(key, None)
+            self._deleted[key] = self._generation
+            if len(self._deleted) > self.max_entries:
+                _, self._deleted_floor = self._deleted.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached values"""
+        with self._lock:
+            self._data.clear()
+
+
+def clear_all_caches() -> None:
+    """Reset every TTLCache - used by tests that recreate the database"""
+    for cache in _caches:
+        cache.clear()
@@ -1,4 +1,6 @@
+import json
 import os
+import orjson
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -13,11 +15,40 @@ if DATABASE_URL.startswith("postgres://"):
 elif DATABASE_URL.startswith("postgresql://") and "+psycopg" not in DATABASE_URL:
     DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+psycopg://", 1)
 
+
+def json_serializer(obj) -> str:
+    """Serialize JSON columns (document blocks, extra_data) with orjson"""
+    try:
+        return orjson.dumps(obj).decode()
+    except orjson.JSONEncodeError:
+        # orjson rejects integers wider than 64 bits; user-supplied JSON may contain them
+        return json.dumps(obj)
+
+
+# Use orjson for JSON/JSONB columns instead of the stdlib json module
+JSON_ENGINE_ARGS = {"json_serializer": json_serializer, "json_deserializer": orjson.loads}
+
+# Connection pool for PostgreSQL. SQLAlchemy's default of 5 + 10 overflow
+# left most request threads queued on the pool instead of the database; main.py
+# sizes its threadpool (THREADPOOL_SIZE) to pool_size + max_overflow by
+# default. Pre-ping drops connections the server closed while idle, and
+# recycling keeps them under typical proxy/idle timeouts.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+
 # SQLite needs special args, PostgreSQL doesn't
 if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False}, **JSON_ENGINE_ARGS)
 else:
-    engine = create_engine(DATABASE_URL)
+    engine = create_engine(
+        DATABASE_URL,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=30,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        **JSON_ENGINE_ARGS
+    )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -1,14 +1,22 @@
 from dotenv import load_dotenv
 load_dotenv()  # Load .env file before other imports
 
-from fastapi import FastAPI, HTTPException, Depends, Query, Request, Form
-from fastapi.responses import HTMLResponse, PlainTextResponse
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response, Form
+from fastapi.responses import HTMLResponse, PlainTextResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import List, Optional
+from sqlalchemy import String, and_, case, func, or_, type_coerce, update
+from sqlalchemy.exc import IntegrityError
+from typing import Any, List, Optional
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache
+import anyio
+import asyncio
+import orjson
 import re
 import os
 import markdown
@@ -19,9 +27,11 @@ from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
-from database import engine, get_db, Base
+from database import engine, get_db, Base, DB_POOL_SIZE, DB_MAX_OVERFLOW
+from cache import TTLCache
 from models import (
-    Category, Topic, Contribution, User, TopicDocument, TopicDocumentRevision, DevRequest
+    Category, Topic, Contribution, User, TopicDocument, TopicDocumentRevision, DevRequest,
+    topic_categories
 )
 from schemas import (
     CategoryCreate, CategoryResponse,
@@ -33,9 +43,9 @@ from schemas import (
     DevRequestCreate, DevRequestUpdate, DevRequestResponse
 )
 from auth import (
-    Agent, generate_api_key, generate_claim_token, generate_verification_code,
+    Agent, generate_api_key, hash_api_key, generate_claim_token, generate_verification_code,
     AgentRegister, AgentRegisterResponse, AgentClaimRequest, AgentStatusResponse, AgentProfileResponse,
-    hash_password, verify_password, generate_session_token
+    hash_password, verify_password, generate_session_token, hash_session_token
 )
 
 # === SECURITY CONFIGURATION ===
@@ -43,6 +53,14 @@ from auth import (
 # Session expiry: 30 days
 SESSION_EXPIRY_DAYS = 30
 
+# Only persist last_active once per interval to avoid a write on every request
+LAST_ACTIVE_UPDATE_SECONDS = 60
+
+# Password hashing runs on its own pool, sized for CPU, so registration and
+# login spikes don't tie up the request threadpool. pbkdf2_hmac releases the
+# GIL, so threads hash in parallel without process/pickling overhead.
+PASSWORD_HASH_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="password-hash")
+
 # Rate limiting configuration - disabled in testing
 TESTING = os.getenv("TESTING", "0") == "1"
 limiter = Limiter(key_func=get_remote_address, enabled=not TESTING)
@@ -50,13 +68,33 @@ limiter = Limiter(key_func=get_remote_address, enabled=not TESTING)
 # CORS allowed origins - allow all for public API
 ALLOWED_ORIGINS = ["*"]
 
+# Usernames and agent names: 3-30 characters, alphanumeric with _ or -
+USERNAME_RE = re.compile(r'^[a-zA-Z0-9_-]{3,30}$')
+
+# X/Twitter handle from a tweet URL on either domain (with or without www.)
+TWEET_HANDLE_RE = re.compile(r'(?:^|[/.])(?:twitter|x)\.com/([A-Za-z0-9_]{1,15})')
+
+# Sync endpoints run on AnyIO worker threads, which default to 40. Every DB
+# handler here is sync and holds a pooled connection, so match the pool's
+# capacity: more threads would only block on pool_timeout, fewer would leave
+# connections idle while requests queue.
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", str(DB_POOL_SIZE + DB_MAX_OVERFLOW)))
+
 # Create tables
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    yield
+
+
 app = FastAPI(
     title="ClawCollab",
     description="The collaboration platform where humans and AI agents work together",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add rate limit exceeded handler
@@ -77,6 +115,38 @@ security = HTTPBearer(auto_error=False)
 
 # === AUTHENTICATION ===
 
+# Token hash -> ("agent", agent id) or ("session", session id). Saves the
+# token lookup on repeat requests; the row is still loaded by primary key.
+auth_cache = TTLCache(ttl_seconds=60, max_entries=10000)
+
+def touch_last_active(principal) -> bool:
+    """Bump last_active on a user or agent if it is stale. Returns True if it changed."""
+    now_utc = datetime.now(timezone.utc)
+    last_active = principal.last_active
+    if last_active is not None:
+        if last_active.tzinfo is None:
+            last_active = last_active.replace(tzinfo=timezone.utc)
+        if now_utc - last_active < timedelta(seconds=LAST_ACTIVE_UPDATE_SECONDS):
+            return False
+    principal.last_active = now_utc.replace(tzinfo=None)  # Store as naive
+    return True
+
+
+def get_agent_by_api_key(api_key: str, db: Session) -> Optional[Agent]:
+    """Resolve an API key to its agent, loading by primary key when cached"""
+    token_hash = hash_api_key(api_key)
+    cached = auth_cache.get(token_hash)
+    if cached and cached[0] == "agent":
+        agent = db.get(Agent, cached[1])
+        if agent:
+            return agent
+
+    agent = db.query(Agent).filter(Agent.api_key_hash == token_hash).first()
+    if agent:
+        auth_cache.set(token_hash, ("agent", agent.id))
+    return agent
+
+
 def get_current_agent(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
@@ -85,11 +155,9 @@ def get_current_agent(
     if not credentials:
         return None
 
-    api_key = credentials.credentials
-    agent = db.query(Agent).filter(Agent.api_key == api_key).first()
+    agent = get_agent_by_api_key(credentials.credentials, db)
 
-    if agent:
-        agent.last_active = datetime.now(timezone.utc).replace(tzinfo=None)
+    if agent and touch_last_active(agent):
         db.commit()
 
     return agent
@@ -107,8 +175,7 @@ def require_agent(
             headers={"WWW-Authenticate": "Bearer"}
         )
 
-    api_key = credentials.credentials
-    agent = db.query(Agent).filter(Agent.api_key == api_key).first()
+    agent = get_agent_by_api_key(credentials.credentials, db)
 
     if not agent:
         raise HTTPException(
@@ -116,8 +183,8 @@ def require_agent(
             detail="Invalid API key. Register at POST /api/v1/agents/register"
         )
 
-    agent.last_active = datetime.now(timezone.utc).replace(tzinfo=None)
-    db.commit()
+    if touch_last_active(agent):
+        db.commit()
 
     return agent
 
@@ -142,18 +209,35 @@ def require_claimed_agent(
 
 # === UTILITY FUNCTIONS ===
 
+# Compiled once at import rather than looked up in re's cache on every call
+SLUG_STRIP_RE = re.compile(r'[^\w\s-]')
+SLUG_DASH_RE = re.compile(r'[-\s]+')
+INTERNAL_LINK_RE = re.compile(r'\[\[([^\]]+)\]\]')
+
+# ASCII fast path for slugify, derived from the two patterns above: drop what
+# SLUG_STRIP_RE drops and turn whitespace into '-', in one str.translate pass
+SLUG_ASCII_TABLE = str.maketrans({
+    chr(c): None if SLUG_STRIP_RE.match(chr(c)) else '-'
+    for c in range(128)
+    if SLUG_STRIP_RE.match(chr(c)) or SLUG_DASH_RE.match(chr(c))
+})
+
+
 def slugify(title: str) -> str:
     """Convert title to URL-friendly slug"""
     slug = title.lower().strip()
-    slug = re.sub(r'[^\w\s-]', '', slug)
-    slug = re.sub(r'[-\s]+', '-', slug)
+    if slug.isascii():
+        slug = slug.translate(SLUG_ASCII_TABLE)
+        # Only dashes are left as separators; most titles have no runs to collapse
+        return SLUG_DASH_RE.sub('-', slug) if '--' in slug else slug
+    slug = SLUG_STRIP_RE.sub('', slug)
+    slug = SLUG_DASH_RE.sub('-', slug)
     return slug
 
 
 def parse_internal_links(content: str) -> List[str]:
     """Extract [[internal links]] from content"""
-    pattern = r'\[\[([^\]]+)\]\]'
-    return re.findall(pattern, content)
+    return INTERNAL_LINK_RE.findall(content)
 
 
 def render_content(content: str, format: str = "markdown") -> str:
@@ -163,22 +247,65 @@ def render_content(content: str, format: str = "markdown") -> str:
         slug = slugify(link_text)
         return f'[{link_text}](/topics/{slug})'
 
-    content = re.sub(r'\[\[([^\]]+)\]\]', replace_link, content)
+    content = INTERNAL_LINK_RE.sub(replace_link, content)
 
     if format == "html":
         return markdown.markdown(content)
     return content
 
 
+def json_response(content: Any) -> Response:
+    """
+    JSON response for endpoints that return plain dicts.
+
+    Endpoints with a response_model are already serialized by Pydantic; for
+    the rest, orjson is faster than the stdlib encoder and writes datetimes
+    itself, in the same format as isoformat().
+    """
+    return Response(orjson.dumps(content), media_type="application/json")
+
+
+def record_vote(db: Session, model, condition, upvote: bool) -> Optional[int]:
+    """
+    Add one up or down vote to the row matching condition and commit.
+
+    The increment happens in a single UPDATE ... RETURNING, so there is no
+    read beforehand or reload afterwards, and concurrent votes can't
+    overwrite each other. Returns the new score, or None if no row matched.
+    """
+    column = model.upvotes if upvote else model.downvotes
+    row = db.execute(
+        update(model).where(condition)
+        .values({column: column + 1})
+        .returning(model.upvotes, model.downvotes)
+    ).first()
+    if row is None:
+        return None
+
+    db.commit()
+    return row.upvotes - row.downvotes
+
+
 # === ROOT & LANDING PAGE ===
 
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+
+@lru_cache(maxsize=None)
+def load_template(name: str) -> Optional[str]:
+    """Read an HTML template once per process (None if it doesn't exist)"""
+    template_path = TEMPLATES_DIR / name
+    if not template_path.exists():
+        return None
+    return template_path.read_text()
+
+
 @app.get("/", response_class=HTMLResponse)
 def root(request: Request):
     base_url = str(request.base_url).rstrip('/')
-    template_path = Path(__file__).parent / "templates" / "index.html"
-    if template_path.exists():
-        html_content = template_path.read_text()
-        html_content = html_content.replace("{{BASE_URL}}", base_url)
+    template = load_template("index.html")
+    if template is not None:
+        html_content = template.replace("{{BASE_URL}}", base_url)
         return HTMLResponse(content=html_content)
     return HTMLResponse("<h1>ClawCollab</h1><p><a href='/docs'>API Docs</a></p>")
 
@@ -189,10 +316,9 @@ def root(request: Request):
 def recent_page(request: Request):
     """Recent changes page"""
     base_url = str(request.base_url).rstrip('/')
-    template_path = Path(__file__).parent / "templates" / "recent.html"
-    if template_path.exists():
-        html_content = template_path.read_text()
-        html_content = html_content.replace("{{BASE_URL}}", base_url)
+    template = load_template("recent.html")
+    if template is not None:
+        html_content = template.replace("{{BASE_URL}}", base_url)
         return HTMLResponse(content=html_content)
     return HTMLResponse("<h1>Recent Changes</h1><p><a href='/api/v1/recent'>View JSON</a></p>")
 
@@ -201,10 +327,9 @@ def recent_page(request: Request):
 def categories_page(request: Request):
     """Categories listing page"""
     base_url = str(request.base_url).rstrip('/')
-    template_path = Path(__file__).parent / "templates" / "categories.html"
-    if template_path.exists():
-        html_content = template_path.read_text()
-        html_content = html_content.replace("{{BASE_URL}}", base_url)
+    template = load_template("categories.html")
+    if template is not None:
+        html_content = template.replace("{{BASE_URL}}", base_url)
         return HTMLResponse(content=html_content)
     return HTMLResponse("<h1>Categories</h1><p><a href='/api/v1/categories'>View JSON</a></p>")
 
@@ -213,10 +338,9 @@ def categories_page(request: Request):
 def category_page(name: str, request: Request):
     """Single category page"""
     base_url = str(request.base_url).rstrip('/')
-    template_path = Path(__file__).parent / "templates" / "category.html"
-    if template_path.exists():
-        html_content = template_path.read_text()
-        html_content = html_content.replace("{{BASE_URL}}", base_url)
+    template = load_template("category.html")
+    if template is not None:
+        html_content = template.replace("{{BASE_URL}}", base_url)
         html_content = html_content.replace("{{CATEGORY}}", name)
         return HTMLResponse(content=html_content)
     return HTMLResponse(f"<h1>Category: {name}</h1><p><a href='/api/v1/category/{name}'>View JSON</a></p>")
@@ -226,10 +350,9 @@ def category_page(name: str, request: Request):
 def agents_page(request: Request):
     """Contributors listing page"""
     base_url = str(request.base_url).rstrip('/')
-    template_path = Path(__file__).parent / "templates" / "agents.html"
-    if template_path.exists():
-        html_content = template_path.read_text()
-        html_content = html_content.replace("{{BASE_URL}}", base_url)
+    template = load_template("agents.html")
+    if template is not None:
+        html_content = template.replace("{{BASE_URL}}", base_url)
         return HTMLResponse(content=html_content)
     return HTMLResponse("<h1>Contributors</h1><p><a href='/api/v1/agents'>View JSON</a></p>")
 
@@ -238,10 +361,9 @@ def agents_page(request: Request):
 def agent_profile_page(name: str, request: Request):
     """Individual agent profile page"""
     base_url = str(request.base_url).rstrip('/')
-    template_path = Path(__file__).parent / "templates" / "agent.html"
-    if template_path.exists():
-        html_content = template_path.read_text()
-        html_content = html_content.replace("{{BASE_URL}}", base_url)
+    template = load_template("agent.html")
+    if template is not None:
+        html_content = template.replace("{{BASE_URL}}", base_url)
         html_content = html_content.replace("{{AGENT_NAME}}", name)
         return HTMLResponse(content=html_content)
     return HTMLResponse(f"<h1>Agent: {name}</h1>")
@@ -251,10 +373,9 @@ def agent_profile_page(name: str, request: Request):
 def topics_page(request: Request):
     """All topics listing page"""
     base_url = str(request.base_url).rstrip('/')
-    template_path = Path(__file__).parent / "templates" / "topics.html"
-    if template_path.exists():
-        html_content = template_path.read_text()
-        html_content = html_content.replace("{{BASE_URL}}", base_url)
+    template = load_template("topics.html")
+    if template is not None:
+        html_content = template.replace("{{BASE_URL}}", base_url)
         return HTMLResponse(content=html_content)
     return HTMLResponse("<h1>Topics</h1><p><a href='/api/v1/topics'>View JSON</a></p>")
 
@@ -263,10 +384,9 @@ def topics_page(request: Request):
 def topic_page(slug: str, request: Request):
     """Single topic page with contributions"""
     base_url = str(request.base_url).rstrip('/')
-    template_path = Path(__file__).parent / "templates" / "topic.html"
-    if template_path.exists():
-        html_content = template_path.read_text()
-        html_content = html_content.replace("{{BASE_URL}}", base_url)
+    template = load_template("topic.html")
+    if template is not None:
+        html_content = template.replace("{{BASE_URL}}", base_url)
         html_content = html_content.replace("{{TOPIC_SLUG}}", slug)
         return HTMLResponse(content=html_content)
     return HTMLResponse(f"<h1>Topic: {slug}</h1><p><a href='/api/v1/topics/{slug}'>View JSON</a></p>")
@@ -276,16 +396,14 @@ def topic_page(slug: str, request: Request):
 def contributors_page(request: Request):
     """Contributors listing page (humans and agents)"""
     base_url = str(request.base_url).rstrip('/')
-    template_path = Path(__file__).parent / "templates" / "contributors.html"
-    if template_path.exists():
-        html_content = template_path.read_text()
-        html_content = html_content.replace("{{BASE_URL}}", base_url)
+    template = load_template("contributors.html")
+    if template is not None:
+        html_content = template.replace("{{BASE_URL}}", base_url)
         return HTMLResponse(content=html_content)
     # Fallback to agents page
-    template_path = Path(__file__).parent / "templates" / "agents.html"
-    if template_path.exists():
-        html_content = template_path.read_text()
-        html_content = html_content.replace("{{BASE_URL}}", base_url)
+    template = load_template("agents.html")
+    if template is not None:
+        html_content = template.replace("{{BASE_URL}}", base_url)
         return HTMLResponse(content=html_content)
     return HTMLResponse("<h1>Contributors</h1><p><a href='/api/v1/agents'>View JSON</a></p>")
 
@@ -295,7 +413,12 @@ def contributors_page(request: Request):
 @app.get("/skill.md", response_class=PlainTextResponse)
 def skill_file(request: Request):
     """Skill file for agents to learn how to use ClawCollab"""
-    base_url = str(request.base_url).rstrip('/')
+    return render_skill_file(str(request.base_url).rstrip('/'))
+
+
+@lru_cache(maxsize=16)
+def render_skill_file(base_url: str) -> str:
+    """skill.md text for a base URL - only the host varies, so it's built once per host"""
     return f"""---
 name: clawcollab
 version: 3.0.0
@@ -761,6 +884,7 @@ curl {base_url}/api/v1/dev/ideas \\
 | Method | Endpoint | Auth | Description |
 |--------|----------|------|-------------|
 | GET | `/api/v1/topics/{{slug}}/export` | - | Export all topic data |
+| GET | `/api/v1/topics/{{slug}}/export.ndjson` | - | Stream export as NDJSON (large topics) |
 | GET | `/api/v1/topics/{{slug}}/document` | - | Get document |
 | POST | `/api/v1/topics/{{slug}}/document` | Required | Create/replace document |
 | PATCH | `/api/v1/topics/{{slug}}/document` | Required | Edit document blocks |
@@ -927,14 +1051,7 @@ GET {base_url}/api/v1/search?q=your+query
 def register_agent(request: Request, data: AgentRegister, db: Session = Depends(get_db)):
     """Register a new AI agent"""
 
-    existing = db.query(Agent).filter(Agent.name == data.name).first()
-    if existing:
-        raise HTTPException(
-            status_code=409,
-            detail=f"Agent name '{data.name}' is already taken. Choose another name."
-        )
-
-    if not re.match(r'^[a-zA-Z0-9_-]{3,30}$', data.name):
+    if not USERNAME_RE.match(data.name):
         raise HTTPException(
             status_code=400,
             detail="Name must be 3-30 characters, alphanumeric with _ or - only"
@@ -948,22 +1065,30 @@ def register_agent(request: Request, data: AgentRegister, db: Session = Depends(
         id=data.name.lower(),
         name=data.name,
         description=data.description,
-        api_key=api_key,
+        api_key_hash=hash_api_key(api_key),
         claim_token=claim_token,
         verification_code=verification_code,
         is_claimed=False
     )
 
+    # The unique name/id constraints reject duplicates (including names that
+    # differ only by case), so there's no need to look the name up first
     db.add(agent)
-    db.commit()
-    db.refresh(agent)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail=f"Agent name '{data.name}' is already taken. Choose another name."
+        )
 
     base_url = str(request.base_url).rstrip('/')
 
     return AgentRegisterResponse(
         success=True,
         agent={
-            "name": agent.name,
+            "name": data.name,
             "api_key": api_key,
             "claim_url": f"{base_url}/claim/{claim_token}",
             "verification_code": verification_code
@@ -1076,6 +1201,12 @@ def claim_page(claim_token: str, db: Session = Depends(get_db)):
     """)
 
 
+def extract_x_handle(tweet_url: Optional[str]) -> str:
+    """X/Twitter handle from a tweet URL, or 'unknown' if there isn't one"""
+    match = TWEET_HANDLE_RE.search(tweet_url or "")
+    return match.group(1) if match else "unknown"
+
+
 @app.post("/api/v1/agents/claim/{claim_token}")
 def claim_agent_form(
     claim_token: str,
@@ -1103,17 +1234,7 @@ def claim_agent_form(
             </body></html>
         """)
 
-    # Extract X/Twitter handle from URL
-    x_handle = "unknown"
-    if tweet_url:
-        if "twitter.com/" in tweet_url:
-            parts = tweet_url.split("twitter.com/")[1].split("/")
-            if parts:
-                x_handle = parts[0]
-        elif "x.com/" in tweet_url:
-            parts = tweet_url.split("x.com/")[1].split("/")
-            if parts:
-                x_handle = parts[0]
+    x_handle = extract_x_handle(tweet_url)
 
     # Mark agent as claimed
     agent.is_claimed = True
@@ -1150,17 +1271,7 @@ def claim_agent_json(
     if agent.is_claimed:
         raise HTTPException(status_code=400, detail="Agent already claimed")
 
-    # Extract X/Twitter handle from URL
-    x_handle = "unknown"
-    tweet_url = claim_data.tweet_url or ""
-    if "twitter.com/" in tweet_url:
-        parts = tweet_url.split("twitter.com/")[1].split("/")
-        if parts:
-            x_handle = parts[0]
-    elif "x.com/" in tweet_url:
-        parts = tweet_url.split("x.com/")[1].split("/")
-        if parts:
-            x_handle = parts[0]
+    x_handle = extract_x_handle(claim_data.tweet_url)
 
     # Mark agent as claimed
     agent.is_claimed = True
@@ -1281,80 +1392,138 @@ def list_agents(
 @app.get("/api/v1/search", response_model=List[SearchResult])
 def search_content(q: str = Query(..., min_length=1), limit: int = 20, db: Session = Depends(get_db)):
     """Search topics and contributions"""
-    search_term = f"%{q.lower()}%"
+    q_lower = q.lower()
+    search_term = f"%{q_lower}%"
+
+    # Score in SQL so ranking and LIMIT happen in the database: a title match
+    # is worth 10, plus one per occurrence in the description
+    description_lower = func.lower(func.coalesce(Topic.description, ""))
+    score = (
+        case((Topic.title.ilike(search_term), 10), else_=0)
+        + (func.length(description_lower) - func.length(func.replace(description_lower, q_lower, ""))) // len(q_lower)
+    ).label("score")
 
     # Search topics
-    topics = db.query(Topic).filter(
+    topics = db.query(Topic.id, Topic.title, Topic.description, score).filter(
         or_(
             Topic.title.ilike(search_term),
             Topic.description.ilike(search_term)
         )
-    ).limit(limit).all()
+    ).order_by(score.desc(), Topic.created_at.desc()).limit(limit).all()
 
+    # Find the snippet position in the original text instead of lowercasing
+    # a full copy of every description
+    q_pattern = re.compile(re.escape(q), re.IGNORECASE)
     results = []
-    q_lower = q.lower()
 
     for topic in topics:
         description = topic.description or ""
-        pos = description.lower().find(q_lower) if description else -1
-        if pos >= 0:
-            start = max(0, pos - 50)
-            end = min(len(description), pos + len(q) + 50)
+        match = q_pattern.search(description)
+        if match:
+            start = max(0, match.start() - 50)
+            end = min(len(description), match.end() + 50)
             snippet = "..." + description[start:end] + "..."
         else:
             snippet = description[:100] + "..." if description else topic.title
 
-        score = 0
-        if q_lower in topic.title.lower():
-            score += 10
-        if description:
-            score += description.lower().count(q_lower)
-
         results.append(SearchResult(
             type="topic",
             id=topic.id,
             title=topic.title,
             description=topic.description,
             snippet=snippet,
-            score=score
+            score=topic.score
         ))
 
-    results.sort(key=lambda x: x.score, reverse=True)
-    return results[:limit]
+    return results
 
 
 # === CATEGORIES ===
 
 @app.get("/api/v1/categories", response_model=List[CategoryResponse])
-def list_categories(db: Session = Depends(get_db)):
-    """List all categories"""
-    categories = db.query(Category).all()
-    return [CategoryResponse(
+def list_categories(request: Request, response: Response, db: Session = Depends(get_db)):
+    """
+    List all categories.
+    Send the ETag from a previous read as If-None-Match to get a 304 when unchanged.
+    """
+    # Categories are only ever added, and topics only join them, so these
+    # counts change whenever the list does
+    category_count, latest_created, link_count = db.query(
+        func.count(Category.name),
+        func.max(Category.created_at),
+        db.query(func.count()).select_from(topic_categories).scalar_subquery()
+    ).one()
+    latest = int(latest_created.timestamp()) if latest_created else 0
+    etag = f'W/"{category_count}-{link_count}-{latest}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    # Count topics in the same query instead of loading each category's topics
+    categories = db.query(
+        Category.name,
+        Category.description,
+        Category.parent_category,
+        func.count(topic_categories.c.topic_id).label("topic_count")
+    ).outerjoin(
+        topic_categories, topic_categories.c.category_name == Category.name
+    ).group_by(Category.name, Category.description, Category.parent_category).all()
+
+    return [CategoryResponse.model_construct(
         name=c.name,
         description=c.description,
         parent_category=c.parent_category,
-        topic_count=len(c.topics) if hasattr(c, 'topics') else 0
+        topic_count=c.topic_count
     ) for c in categories]
 
 
+# Topic lists keyed by category name. Dropped when a topic is added to the
+# category; scores and contribution counts may lag by up to the TTL.
+category_topics_cache = TTLCache(ttl_seconds=60)
+
+
 @app.get("/api/v1/category/{name}", response_model=List[TopicListItem])
 def get_category_topics(name: str, db: Session = Depends(get_db)):
     """Get topics in category"""
-    category = db.query(Category).filter(Category.name == name).first()
-    if not category:
+    cached = category_topics_cache.get(name)
+    if cached is not None:
+        return cached
+    generation = category_topics_cache.generation(name)
+
+    # Join through topic_categories for just the listed columns instead of
+    # loading full Topic rows via category.topics
+    rows = db.query(
+        Topic.id,
+        Topic.slug,
+        Topic.title,
+        Topic.description,
+        Topic.created_by,
+        Topic.created_by_type,
+        Topic.contribution_count,
+        Topic.updated_at,
+        Topic.upvotes,
+        Topic.downvotes
+    ).join(
+        topic_categories, topic_categories.c.topic_id == Topic.id
+    ).filter(topic_categories.c.category_name == name).all()
+
+    # Only an empty result needs to tell "no topics" from "no such category"
+    if not rows and not db.query(Category.name).filter(Category.name == name).first():
         raise HTTPException(status_code=404, detail=f"Category '{name}' not found")
 
-    return [TopicListItem(
+    topics = [TopicListItem.model_construct(
         id=t.id,
         slug=t.slug,
         title=t.title,
         description=t.description,
         created_by=t.created_by,
         created_by_type=t.created_by_type,
-        contribution_count=len(t.contributions),
+        contribution_count=t.contribution_count or 0,
         updated_at=t.updated_at,
-        score=(t.upvotes or 0) - (t.downvotes or 0)
-    ) for t in category.topics]
+        score=t.upvotes - t.downvotes
+    ) for t in rows]
+    category_topics_cache.set(name, topics, generation)
+    return topics
 
 
 @app.post("/api/v1/category", response_model=CategoryResponse)
@@ -1388,10 +1557,17 @@ def create_category(
 
 # === STATS ===
 
+# Platform-wide counts - dashboards poll this, and a few seconds of staleness
+# is fine, so the COUNT queries run at most once per TTL
+stats_cache = TTLCache(ttl_seconds=30, max_entries=1)
+
+
 @app.get("/api/v1/stats")
 def get_stats(db: Session = Depends(get_db)):
     """Get platform statistics"""
-    from sqlalchemy import func
+    cached = stats_cache.get("stats")
+    if cached is not None:
+        return cached
 
     category_count = db.query(Category).count()
     agent_count = db.query(Agent).filter(Agent.is_claimed == True).count()
@@ -1405,7 +1581,7 @@ def get_stats(db: Session = Depends(get_db)):
         func.count(Contribution.id).label('contribution_count')
     ).group_by(Contribution.author).order_by(func.count(Contribution.id).desc()).limit(10).all()
 
-    return {
+    stats = {
         "categories": category_count,
         "agents": agent_count,
         "topics": topic_count,
@@ -1414,6 +1590,8 @@ def get_stats(db: Session = Depends(get_db)):
         "contributors": agent_count + user_count,
         "top_contributors": [{"name": c[0], "contributions": c[1]} for c in top_contributors]
     }
+    stats_cache.set("stats", stats)
+    return stats
 
 
 # =============================================================================
@@ -1428,67 +1606,102 @@ def get_current_user_or_agent(
     db: Session = Depends(get_db)
 ):
     """Get current user (human) or agent from token"""
+    return authenticate(credentials, db)
+
+
+def resume_user_session(session: UserSession, db: Session, commit: bool = True) -> Optional[User]:
+    """
+    Return the user behind a session, or None if it is inactive or expired.
+
+    Expired sessions are deactivated. Sessions within 7 days of expiry are
+    extended, and the change is committed unless commit=False.
+    """
+    if not session.is_active:
+        return None
+
+    now_utc = datetime.now(timezone.utc)
+
+    # Check if session has an explicit expiry
+    if session.expires_at:
+        # Make expires_at timezone-aware if it isn't
+        expires_at = session.expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+
+        # Check if session is expired
+        if now_utc > expires_at:
+            session.is_active = False
+            db.commit()
+            return None
+    else:
+        # Fallback: check created_at + SESSION_EXPIRY_DAYS
+        created_at = session.created_at
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+
+        session_age = now_utc - created_at
+        if session_age > timedelta(days=SESSION_EXPIRY_DAYS):
+            session.is_active = False
+            db.commit()
+            return None
+
+    # Update user last activity
+    user = db.get(User, session.user_id)
+    if not user:
+        return None
+    changed = touch_last_active(user)
+
+    # Auto-extend session if it's within 7 days of expiry
+    if session.expires_at:
+        days_until_expiry = (expires_at - now_utc).days
+        if days_until_expiry <= 7:  # Extend if within 7 days
+            session.expires_at = now_utc + timedelta(days=SESSION_EXPIRY_DAYS)
+            changed = True
+
+    if changed and commit:
+        db.commit()
+    return user
+
+
+def authenticate(credentials: Optional[HTTPAuthorizationCredentials], db: Session, commit: bool = True):
+    """
+    Resolve a bearer token to (user or agent, auth type), or (None, None).
+
+    Bookkeeping (last_active, session extension) is committed here unless
+    commit=False, in which case it is left pending for the caller's own
+    commit so a write request costs one transaction instead of two.
+    """
     if not credentials:
         return None, None
 
     token = credentials.credentials
-
-    # Check if it's a user session token (stored in database)
-    if token.startswith("clawcollab_session_"):
+    token_hash = hash_session_token(token)
+
+    # A cached session only skips the token lookup; the row is still checked
+    # below so logouts, revokes and expiry take effect immediately
+    cached = auth_cache.get(token_hash)
+    session = None
+    if cached and cached[0] == "session":
+        session = db.get(UserSession, cached[1])
+    elif token.startswith("clawcollab_session_"):
         session = db.query(UserSession).filter(
-            UserSession.token == token,
+            UserSession.token_hash == token_hash,
             UserSession.is_active == True
         ).first()
-        if session:
-            now_utc = datetime.now(timezone.utc)
-            
-            # Check if session has an explicit expiry
-            if session.expires_at:
-                # Make expires_at timezone-aware if it isn't
-                expires_at = session.expires_at
-                if expires_at.tzinfo is None:
-                    expires_at = expires_at.replace(tzinfo=timezone.utc)
-                
-                # Check if session is expired
-                if now_utc > expires_at:
-                    session.is_active = False
-                    db.commit()
-                    return None, None
-            else:
-                # Fallback: check created_at + SESSION_EXPIRY_DAYS
-                created_at = session.created_at
-                if created_at.tzinfo is None:
-                    created_at = created_at.replace(tzinfo=timezone.utc)
-                
-                session_age = now_utc - created_at
-                if session_age > timedelta(days=SESSION_EXPIRY_DAYS):
-                    session.is_active = False
-                    db.commit()
-                    return None, None
-
-            # Update user last activity
-            user = db.query(User).filter(User.id == session.user_id).first()
-            if user:
-                user.last_active = now_utc.replace(tzinfo=None)  # Store as naive
-                
-                # Auto-extend session if it's within 7 days of expiry
-                if session.expires_at:
-                    expires_at = session.expires_at
-                    if expires_at.tzinfo is None:
-                        expires_at = expires_at.replace(tzinfo=timezone.utc)
-                    
-                    days_until_expiry = (expires_at - now_utc).days
-                    if days_until_expiry <= 7:  # Extend if within 7 days
-                        session.expires_at = now_utc + timedelta(days=SESSION_EXPIRY_DAYS)
-                        db.commit()
-                db.commit()
-                return user, "human"
+
+    if session is not None:
+        user = resume_user_session(session, db, commit)
+        if user:
+            auth_cache.set(token_hash, ("session", session.id))
+            return user, "human"
+        auth_cache.delete(token_hash)
+        return None, None
 
     # Check if it's an agent API key
-    agent = db.query(Agent).filter(Agent.api_key == token).first()
+    agent = get_agent_by_api_key(token, db)
     if agent:
-        agent.last_active = datetime.now(timezone.utc).replace(tzinfo=None)
-        db.commit()
+        if touch_last_active(agent) and commit:
+            db.commit()
         return agent, "agent"
 
     return None, None
@@ -1502,7 +1715,8 @@ def require_auth(
     if not credentials:
         raise HTTPException(status_code=401, detail="Authentication required")
 
-    user_or_agent, auth_type = get_current_user_or_agent(credentials, db)
+    # Every caller writes and commits, so activity bookkeeping joins that commit
+    user_or_agent, auth_type = authenticate(credentials, db, commit=False)
 
     if not user_or_agent:
         raise HTTPException(status_code=401, detail="Invalid token")
@@ -1515,41 +1729,24 @@ def require_auth(
 
 # === USER REGISTRATION & LOGIN ===
 
-@app.post("/api/v1/users/register")
-@limiter.limit("5/minute")  # Rate limit: 5 registrations per minute per IP
-def register_user(request: Request, user_data: UserCreate, db: Session = Depends(get_db)):
-    """Register a new human user"""
-    # Check if username exists
-    if db.query(User).filter(User.username == user_data.username).first():
-        raise HTTPException(status_code=409, detail="Username already taken")
+def run_password_hasher(hasher, *args):
+    """Run a password hashing function on the dedicated hashing pool"""
+    return asyncio.get_running_loop().run_in_executor(PASSWORD_HASH_POOL, hasher, *args)
 
-    # Check if email exists
-    if db.query(User).filter(User.email == user_data.email).first():
-        raise HTTPException(status_code=409, detail="Email already registered")
 
-    # Validate username
-    if not re.match(r'^[a-zA-Z0-9_-]{3,30}$', user_data.username):
-        raise HTTPException(status_code=400, detail="Username must be 3-30 characters, alphanumeric with _ or -")
-
-    # Create user
-    user = User(
-        username=user_data.username,
-        email=user_data.email,
-        password_hash=hash_password(user_data.password),
-        display_name=user_data.display_name or user_data.username
-    )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-
-    # Generate session token and store in database with expiry
+def start_user_session(user: User, db: Session) -> dict:
+    """Create a persistent session for a user and return the login payload"""
+    # Generate session token and store in database with expiry (timezone-aware)
     token = generate_session_token()
+    now_utc = datetime.now(timezone.utc)
     session = UserSession(
         user_id=user.id,
-        token=token,
-        expires_at=datetime.now(timezone.utc) + timedelta(days=SESSION_EXPIRY_DAYS)
+        token_hash=hash_session_token(token),
+        expires_at=now_utc + timedelta(days=SESSION_EXPIRY_DAYS)
     )
     db.add(session)
+
+    user.last_active = now_utc.replace(tzinfo=None)  # Store as naive in DB
     db.commit()
 
     return {
@@ -1560,46 +1757,62 @@ def register_user(request: Request, user_data: UserCreate, db: Session = Depends
             "email": user.email,
             "display_name": user.display_name
         },
-        "token": token,
-        "message": "Welcome to ClawCollab!"
+        "token": token
     }
 
 
+@app.post("/api/v1/users/register")
+@limiter.limit("5/minute")  # Rate limit: 5 registrations per minute per IP
+async def register_user(request: Request, user_data: UserCreate, db: Session = Depends(get_db)):
+    """Register a new human user"""
+    def check_available():
+        # Check if username exists
+        if db.query(User).filter(User.username == user_data.username).first():
+            raise HTTPException(status_code=409, detail="Username already taken")
+
+        # Check if email exists
+        if db.query(User).filter(User.email == user_data.email).first():
+            raise HTTPException(status_code=409, detail="Email already registered")
+
+    def create_user(password_hash: str) -> dict:
+        user = User(
+            username=user_data.username,
+            email=user_data.email,
+            password_hash=password_hash,
+            display_name=user_data.display_name or user_data.username
+        )
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        return start_user_session(user, db)
+
+    await run_in_threadpool(check_available)
+
+    # Validate username
+    if not USERNAME_RE.match(user_data.username):
+        raise HTTPException(status_code=400, detail="Username must be 3-30 characters, alphanumeric with _ or -")
+
+    password_hash = await run_password_hasher(hash_password, user_data.password)
+    response = await run_in_threadpool(create_user, password_hash)
+    response["message"] = "Welcome to ClawCollab!"
+    return response
+
+
 @app.post("/api/v1/users/login")
 @limiter.limit("10/minute")  # Rate limit: 10 login attempts per minute per IP
-def login_user(request: Request, login_data: UserLogin, db: Session = Depends(get_db)):
+async def login_user(request: Request, login_data: UserLogin, db: Session = Depends(get_db)):
     """Login a human user"""
-    user = db.query(User).filter(User.email == login_data.email).first()
+    user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.email == login_data.email).first()
+    )
 
-    if not user or not verify_password(login_data.password, user.password_hash):
+    if not user or not await run_password_hasher(verify_password, login_data.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
     if not user.is_active:
         raise HTTPException(status_code=403, detail="Account is disabled")
 
-    # Generate session token and store in database with expiry (timezone-aware)
-    token = generate_session_token()
-    now_utc = datetime.now(timezone.utc)
-    session = UserSession(
-        user_id=user.id,
-        token=token,
-        expires_at=now_utc + timedelta(days=SESSION_EXPIRY_DAYS)
-    )
-    db.add(session)
-
-    user.last_active = now_utc.replace(tzinfo=None)  # Store as naive in DB
-    db.commit()
-
-    return {
-        "success": True,
-        "user": {
-            "id": user.id,
-            "username": user.username,
-            "email": user.email,
-            "display_name": user.display_name
-        },
-        "token": token
-    }
+    return await run_in_threadpool(start_user_session, user, db)
 
 
 @app.post("/api/v1/users/refresh-session")
@@ -1618,7 +1831,7 @@ def refresh_session(
         raise HTTPException(status_code=400, detail="Invalid session token")
     
     session = db.query(UserSession).filter(
-        UserSession.token == token,
+        UserSession.token_hash == hash_session_token(token),
         UserSession.is_active == True
     ).first()
     
@@ -1636,6 +1849,7 @@ def refresh_session(
         if now_utc > expires_at:
             session.is_active = False
             db.commit()
+            auth_cache.delete(hash_session_token(token))
             raise HTTPException(status_code=401, detail="Session expired")
     
     # Extend session expiry
@@ -1644,7 +1858,7 @@ def refresh_session(
     # Update user last activity
     user = db.query(User).filter(User.id == session.user_id).first()
     if user:
-        user.last_active = now_utc.replace(tzinfo=None)
+        touch_last_active(user)
     
     db.commit()
     
@@ -1660,10 +1874,9 @@ def refresh_session(
 def contributor_profile_page(username: str, request: Request):
     """Individual contributor profile page"""
     base_url = str(request.base_url).rstrip('/')
-    template_path = Path(__file__).parent / "templates" / "contributor.html"
-    if template_path.exists():
-        html_content = template_path.read_text()
-        html_content = html_content.replace("{{BASE_URL}}", base_url)
+    template = load_template("contributor.html")
+    if template is not None:
+        html_content = template.replace("{{BASE_URL}}", base_url)
         html_content = html_content.replace("{{USERNAME}}", username)
         return HTMLResponse(content=html_content)
     return HTMLResponse(f"<h1>Contributor: {username}</h1>")
@@ -1687,7 +1900,7 @@ def list_users(
 
     users = query.limit(limit).all()
 
-    return {
+    return json_response({
         "success": True,
         "users": [{
             "username": u.username,
@@ -1696,9 +1909,9 @@ def list_users(
             "contribution_count": u.contribution_count or 0,
             "karma": u.karma or 0,
             "is_verified": u.is_verified,
-            "created_at": u.created_at.isoformat() if u.created_at else None
+            "created_at": u.created_at
         } for u in users]
-    }
+    })
 
 
 @app.get("/api/v1/users/me")
@@ -1738,6 +1951,10 @@ def get_my_user_profile(
         }
 
 
+# Length of the contribution content preview shown on profile pages
+CONTENT_PREVIEW_LENGTH = 200
+
+
 @app.get("/api/v1/users/{username}")
 def get_user_profile(username: str, db: Session = Depends(get_db)):
     """Get a specific user's public profile with their contributions and topics"""
@@ -1752,13 +1969,25 @@ def get_user_profile(username: str, db: Session = Depends(get_db)):
         Topic.created_by_type == "human"
     ).order_by(Topic.created_at.desc()).limit(20).all()
 
-    # Get contributions by this user
-    contributions = db.query(Contribution).filter(
+    # Get contributions by this user - only a short preview is returned,
+    # so truncate in SQL instead of pulling full content blobs
+    contributions = db.query(
+        Contribution.id,
+        Contribution.topic_id,
+        Contribution.content_type,
+        Contribution.title,
+        func.substr(Contribution.content, 1, CONTENT_PREVIEW_LENGTH + 3).label("preview"),
+        Contribution.upvotes,
+        Contribution.downvotes,
+        Contribution.created_at,
+        Topic.slug.label("topic_slug"),
+        Topic.title.label("topic_title")
+    ).outerjoin(Topic, Topic.id == Contribution.topic_id).filter(
         Contribution.author == username,
         Contribution.author_type == "human"
     ).order_by(Contribution.created_at.desc()).limit(50).all()
 
-    return {
+    return json_response({
         "success": True,
         "user": {
             "username": user.username,
@@ -1767,28 +1996,28 @@ def get_user_profile(username: str, db: Session = Depends(get_db)):
             "contribution_count": user.contribution_count or 0,
             "karma": user.karma or 0,
             "is_verified": user.is_verified,
-            "created_at": user.created_at.isoformat() if user.created_at else None
+            "created_at": user.created_at
         },
         "topics_created": [{
             "id": t.id,
             "slug": t.slug,
             "title": t.title,
             "description": t.description,
-            "contribution_count": db.query(Contribution).filter(Contribution.topic_id == t.id).count(),
-            "created_at": t.created_at.isoformat() if t.created_at else None
+            "contribution_count": t.contribution_count or 0,
+            "created_at": t.created_at
         } for t in topics_created],
         "contributions": [{
             "id": c.id,
             "topic_id": c.topic_id,
-            "topic_slug": db.query(Topic).filter(Topic.id == c.topic_id).first().slug if db.query(Topic).filter(Topic.id == c.topic_id).first() else None,
-            "topic_title": db.query(Topic).filter(Topic.id == c.topic_id).first().title if db.query(Topic).filter(Topic.id == c.topic_id).first() else None,
+            "topic_slug": c.topic_slug,
+            "topic_title": c.topic_title,
             "content_type": c.content_type,
             "title": c.title,
-            "content": c.content[:200] + "..." if c.content and len(c.content) > 200 else c.content,
+            "content": c.preview[:CONTENT_PREVIEW_LENGTH] + "..." if c.preview and len(c.preview) > CONTENT_PREVIEW_LENGTH else c.preview,
             "score": (c.upvotes or 0) - (c.downvotes or 0),
-            "created_at": c.created_at.isoformat() if c.created_at else None
+            "created_at": c.created_at
         } for c in contributions]
-    }
+    })
 
 
 @app.get("/api/v1/agents/{name}")
@@ -1805,13 +2034,25 @@ def get_agent_profile(name: str, db: Session = Depends(get_db)):
         Topic.created_by_type == "agent"
     ).order_by(Topic.created_at.desc()).limit(20).all()
 
-    # Get contributions by this agent
-    contributions = db.query(Contribution).filter(
+    # Get contributions by this agent - only a short preview is returned,
+    # so truncate in SQL instead of pulling full content blobs
+    contributions = db.query(
+        Contribution.id,
+        Contribution.topic_id,
+        Contribution.content_type,
+        Contribution.title,
+        func.substr(Contribution.content, 1, CONTENT_PREVIEW_LENGTH + 3).label("preview"),
+        Contribution.upvotes,
+        Contribution.downvotes,
+        Contribution.created_at,
+        Topic.slug.label("topic_slug"),
+        Topic.title.label("topic_title")
+    ).outerjoin(Topic, Topic.id == Contribution.topic_id).filter(
         Contribution.author == name,
         Contribution.author_type == "agent"
     ).order_by(Contribution.created_at.desc()).limit(50).all()
 
-    return {
+    return json_response({
         "success": True,
         "agent": {
             "name": agent.name,
@@ -1819,28 +2060,28 @@ def get_agent_profile(name: str, db: Session = Depends(get_db)):
             "edit_count": agent.edit_count or 0,
             "karma": agent.karma or 0,
             "owner_x_handle": agent.owner_x_handle,
-            "created_at": agent.created_at.isoformat() if agent.created_at else None
+            "created_at": agent.created_at
         },
         "topics_created": [{
             "id": t.id,
             "slug": t.slug,
             "title": t.title,
             "description": t.description,
-            "contribution_count": db.query(Contribution).filter(Contribution.topic_id == t.id).count(),
-            "created_at": t.created_at.isoformat() if t.created_at else None
+            "contribution_count": t.contribution_count or 0,
+            "created_at": t.created_at
         } for t in topics_created],
         "contributions": [{
             "id": c.id,
             "topic_id": c.topic_id,
-            "topic_slug": db.query(Topic).filter(Topic.id == c.topic_id).first().slug if db.query(Topic).filter(Topic.id == c.topic_id).first() else None,
-            "topic_title": db.query(Topic).filter(Topic.id == c.topic_id).first().title if db.query(Topic).filter(Topic.id == c.topic_id).first() else None,
+            "topic_slug": c.topic_slug,
+            "topic_title": c.topic_title,
             "content_type": c.content_type,
             "title": c.title,
-            "content": c.content[:200] + "..." if c.content and len(c.content) > 200 else c.content,
+            "content": c.preview[:CONTENT_PREVIEW_LENGTH] + "..." if c.preview and len(c.preview) > CONTENT_PREVIEW_LENGTH else c.preview,
             "score": (c.upvotes or 0) - (c.downvotes or 0),
-            "created_at": c.created_at.isoformat() if c.created_at else None
+            "created_at": c.created_at
         } for c in contributions]
-    }
+    })
 
 
 # === TOPICS ===
@@ -1859,10 +2100,6 @@ def create_topic(
     # Generate slug
     slug = slugify(topic_data.title)
 
-    # Check if exists
-    if db.query(Topic).filter(Topic.slug == slug).first():
-        raise HTTPException(status_code=409, detail=f"Topic '{slug}' already exists")
-
     # Get author name
     author_name = user_or_agent.username if auth_type == "human" else user_or_agent.name
 
@@ -1875,16 +2112,32 @@ def create_topic(
         created_by_type=auth_type
     )
 
-    # Add categories
-    for cat_name in (topic_data.categories or []):
-        category = db.query(Category).filter(Category.name == cat_name).first()
-        if not category:
-            category = Category(name=cat_name)
-            db.add(category)
-        topic.categories.append(category)
-
+    # Add categories - one IN query for the existing ones, create the rest
+    cat_names = list(dict.fromkeys(topic_data.categories or []))
+    if cat_names:
+        existing = {c.name: c for c in db.query(Category).filter(Category.name.in_(cat_names)).all()}
+        for cat_name in cat_names:
+            category = existing.get(cat_name)
+            if not category:
+                category = Category(name=cat_name)
+                db.add(category)
+            topic.categories.append(category)
+
+    # Capture names before commit expires the relationship and forces a reload
+    category_names = [c.name for c in topic.categories]
+    topic.category_names = category_names
+
+    # Rely on the unique slug constraint instead of checking for the slug first
     db.add(topic)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        if db.query(Topic.id).filter(Topic.slug == slug).first():
+            raise HTTPException(status_code=409, detail=f"Topic '{slug}' already exists")
+        raise
+    for cat_name in category_names:
+        category_topics_cache.delete(cat_name)
     db.refresh(topic)
 
     return TopicResponse(
@@ -1897,7 +2150,7 @@ def create_topic(
         created_at=topic.created_at,
         updated_at=topic.updated_at,
         contribution_count=0,
-        categories=[c.name for c in topic.categories],
+        categories=category_names,
         upvotes=topic.upvotes or 0,
         downvotes=topic.downvotes or 0,
         score=(topic.upvotes or 0) - (topic.downvotes or 0)
@@ -1908,38 +2161,67 @@ def create_topic(
 def list_topics(
     limit: int = 50,
     sort: str = "recent",
+    after_id: Optional[int] = None,
     db: Session = Depends(get_db)
 ):
-    """List all topics"""
-    from sqlalchemy import func
+    """
+    List all topics.
 
-    query = db.query(Topic)
+    To page through, pass the id of the last topic from the previous page as
+    after_id. Paging seeks from that topic's position in the index instead of
+    counting past an OFFSET, so deep pages cost the same as the first.
+    """
+    # Only the columns the list shows - no category JSON or full ORM objects
+    query = db.query(
+        Topic.id,
+        Topic.slug,
+        Topic.title,
+        Topic.description,
+        Topic.created_by,
+        Topic.created_by_type,
+        Topic.contribution_count,
+        Topic.updated_at,
+        Topic.upvotes,
+        Topic.downvotes
+    )
+
+    if after_id is not None:
+        # Read and compare created_at exactly as stored: SQLite keeps
+        # server-default timestamps as text without microseconds, which a
+        # round trip through datetime would not reproduce
+        created_at = type_coerce(Topic.created_at, String)
+        cursor = db.query(created_at).filter(Topic.id == after_id).scalar()
+        # A missing topic would otherwise look like the end of the list
+        if cursor is None:
+            raise HTTPException(status_code=400, detail="Invalid after_id")
+        if sort == "oldest":
+            query = query.filter(or_(
+                created_at > cursor,
+                and_(created_at == cursor, Topic.id > after_id)
+            ))
+        else:
+            query = query.filter(or_(
+                created_at < cursor,
+                and_(created_at == cursor, Topic.id < after_id)
+            ))
 
+    # id breaks ties between topics created in the same instant, so pages
+    # never skip or repeat a topic
     if sort == "oldest":
-        query = query.order_by(Topic.created_at)
+        query = query.order_by(Topic.created_at, Topic.id)
     else:  # recent
-        query = query.order_by(Topic.created_at.desc())
+        query = query.order_by(Topic.created_at.desc(), Topic.id.desc())
 
     topics = query.limit(limit).all()
 
-    # Get contribution counts in a single query
-    contribution_counts = {}
-    if topics:
-        topic_ids = [t.id for t in topics]
-        counts = db.query(
-            Contribution.topic_id,
-            func.count(Contribution.id)
-        ).filter(Contribution.topic_id.in_(topic_ids)).group_by(Contribution.topic_id).all()
-        contribution_counts = {c[0]: c[1] for c in counts}
-
-    return [TopicListItem(
+    return [TopicListItem.model_construct(
         id=t.id,
         slug=t.slug,
         title=t.title,
         description=t.description,
         created_by=t.created_by,
         created_by_type=t.created_by_type,
-        contribution_count=contribution_counts.get(t.id, 0),
+        contribution_count=t.contribution_count or 0,
         updated_at=t.updated_at,
         score=(t.upvotes or 0) - (t.downvotes or 0)
     ) for t in topics]
@@ -1953,10 +2235,7 @@ def get_topic(slug: str, db: Session = Depends(get_db)):
     if not topic:
         raise HTTPException(status_code=404, detail=f"Topic '{slug}' not found")
 
-    # Count contributions directly
-    contribution_count = db.query(Contribution).filter(Contribution.topic_id == topic.id).count()
-
-    return TopicResponse(
+    return TopicResponse.model_construct(
         id=topic.id,
         slug=topic.slug,
         title=topic.title,
@@ -1965,8 +2244,8 @@ def get_topic(slug: str, db: Session = Depends(get_db)):
         created_by_type=topic.created_by_type,
         created_at=topic.created_at,
         updated_at=topic.updated_at,
-        contribution_count=contribution_count,
-        categories=[c.name for c in topic.categories],
+        contribution_count=topic.contribution_count or 0,
+        categories=topic.category_names or [],
         upvotes=topic.upvotes or 0,
         downvotes=topic.downvotes or 0,
         score=(topic.upvotes or 0) - (topic.downvotes or 0)
@@ -1975,6 +2254,34 @@ def get_topic(slug: str, db: Session = Depends(get_db)):
 
 # === CONTRIBUTIONS ===
 
+def build_contribution_response(c: Contribution) -> ContributionResponse:
+    """
+    Build the API representation of a contribution.
+
+    Rows come straight from the database, so model_construct() skips
+    validation - this runs once per row when streaming large topics.
+    """
+    return ContributionResponse.model_construct(
+        id=c.id,
+        topic_id=c.topic_id,
+        reply_to=c.reply_to,
+        content_type=c.content_type,
+        title=c.title,
+        content=c.content,
+        language=c.language,
+        file_url=c.file_url,
+        file_name=c.file_name,
+        extra_data=c.extra_data or {},
+        author=c.author,
+        author_type=c.author_type,
+        upvotes=c.upvotes or 0,
+        downvotes=c.downvotes or 0,
+        score=(c.upvotes or 0) - (c.downvotes or 0),
+        created_at=c.created_at,
+        updated_at=c.updated_at
+    )
+
+
 @app.post("/api/v1/topics/{slug}/contribute", response_model=ContributionResponse)
 @limiter.limit("20/minute")  # Rate limit: 20 contributions per minute per IP
 def add_contribution(
@@ -2022,6 +2329,12 @@ def add_contribution(
 
     db.add(contribution)
 
+    # Bump the cached count atomically so concurrent contributions don't race
+    db.query(Topic).filter(Topic.id == topic.id).update(
+        {Topic.contribution_count: Topic.contribution_count + 1},
+        synchronize_session=False
+    )
+
     # Update contributor stats
     if auth_type == "human":
         user_or_agent.contribution_count = (user_or_agent.contribution_count or 0) + 1
@@ -2031,25 +2344,11 @@ def add_contribution(
     db.commit()
     db.refresh(contribution)
 
-    return ContributionResponse(
-        id=contribution.id,
-        topic_id=contribution.topic_id,
-        reply_to=contribution.reply_to,
-        content_type=contribution.content_type,
-        title=contribution.title,
-        content=contribution.content,
-        language=contribution.language,
-        file_url=contribution.file_url,
-        file_name=contribution.file_name,
-        extra_data=contribution.extra_data or {},
-        author=contribution.author,
-        author_type=contribution.author_type,
-        upvotes=contribution.upvotes or 0,
-        downvotes=contribution.downvotes or 0,
-        score=(contribution.upvotes or 0) - (contribution.downvotes or 0),
-        created_at=contribution.created_at,
-        updated_at=contribution.updated_at
-    )
+    return build_contribution_response(contribution)
+
+
+# Rows fetched per server-side cursor batch when streaming contributions
+CONTRIBUTION_STREAM_BATCH_SIZE = 500
 
 
 @app.get("/api/v1/topics/{slug}/contributions", response_model=List[ContributionResponse])
@@ -2070,31 +2369,23 @@ def get_contributions(
         query = query.filter(Contribution.content_type == content_type)
 
     if sort == "new":
-        query = query.order_by(Contribution.created_at.desc())
+        query = query.order_by(Contribution.created_at.desc(), Contribution.id.desc())
     else:  # top
-        query = query.order_by((Contribution.upvotes - Contribution.downvotes).desc())
+        # id keeps equal scores in a stable order across requests
+        query = query.order_by((Contribution.upvotes - Contribution.downvotes).desc(), Contribution.id.desc())
 
-    contributions = query.all()
+    def generate():
+        # Stream rows through a server-side cursor so large topics use constant
+        # memory. StreamingResponse bypasses response_model, so each row is
+        # dumped the way FastAPI serializes ContributionResponse
+        yield b"["
+        for i, c in enumerate(query.yield_per(CONTRIBUTION_STREAM_BATCH_SIZE)):
+            if i:
+                yield b","
+            yield orjson.dumps(build_contribution_response(c).model_dump(mode="json", by_alias=True))
+        yield b"]"
 
-    return [ContributionResponse(
-        id=c.id,
-        topic_id=c.topic_id,
-        reply_to=c.reply_to,
-        content_type=c.content_type,
-        title=c.title,
-        content=c.content,
-        language=c.language,
-        file_url=c.file_url,
-        file_name=c.file_name,
-        extra_data=c.extra_data or {},
-        author=c.author,
-        author_type=c.author_type,
-        upvotes=c.upvotes or 0,
-        downvotes=c.downvotes or 0,
-        score=(c.upvotes or 0) - (c.downvotes or 0),
-        created_at=c.created_at,
-        updated_at=c.updated_at
-    ) for c in contributions]
+    return StreamingResponse(generate(), media_type="application/json")
 
 
 @app.post("/api/v1/contributions/{contribution_id}/upvote")
@@ -2108,16 +2399,13 @@ def upvote_contribution(
     """Upvote a contribution"""
     user_or_agent, auth_type = require_auth(credentials, db)
 
-    contribution = db.query(Contribution).filter(Contribution.id == contribution_id).first()
-    if not contribution:
+    score = record_vote(db, Contribution, Contribution.id == contribution_id, upvote=True)
+    if score is None:
         raise HTTPException(status_code=404, detail="Contribution not found")
 
-    contribution.upvotes = (contribution.upvotes or 0) + 1
-    db.commit()
-
     return {
         "success": True,
-        "score": (contribution.upvotes or 0) - (contribution.downvotes or 0)
+        "score": score
     }
 
 
@@ -2132,16 +2420,13 @@ def downvote_contribution(
     """Downvote a contribution"""
     user_or_agent, auth_type = require_auth(credentials, db)
 
-    contribution = db.query(Contribution).filter(Contribution.id == contribution_id).first()
-    if not contribution:
+    score = record_vote(db, Contribution, Contribution.id == contribution_id, upvote=False)
+    if score is None:
         raise HTTPException(status_code=404, detail="Contribution not found")
 
-    contribution.downvotes = (contribution.downvotes or 0) + 1
-    db.commit()
-
     return {
         "success": True,
-        "score": (contribution.upvotes or 0) - (contribution.downvotes or 0)
+        "score": score
     }
 
 
@@ -2158,16 +2443,13 @@ def upvote_topic(
     """Upvote a topic"""
     user_or_agent, auth_type = require_auth(credentials, db)
 
-    topic = db.query(Topic).filter(Topic.slug == slug).first()
-    if not topic:
+    score = record_vote(db, Topic, Topic.slug == slug, upvote=True)
+    if score is None:
         raise HTTPException(status_code=404, detail="Topic not found")
 
-    topic.upvotes = (topic.upvotes or 0) + 1
-    db.commit()
-
     return {
         "success": True,
-        "score": (topic.upvotes or 0) - (topic.downvotes or 0)
+        "score": score
     }
 
 
@@ -2182,16 +2464,13 @@ def downvote_topic(
     """Downvote a topic"""
     user_or_agent, auth_type = require_auth(credentials, db)
 
-    topic = db.query(Topic).filter(Topic.slug == slug).first()
-    if not topic:
+    score = record_vote(db, Topic, Topic.slug == slug, upvote=False)
+    if score is None:
         raise HTTPException(status_code=404, detail="Topic not found")
 
-    topic.downvotes = (topic.downvotes or 0) + 1
-    db.commit()
-
     return {
         "success": True,
-        "score": (topic.upvotes or 0) - (topic.downvotes or 0)
+        "score": score
     }
 
 
@@ -2199,12 +2478,135 @@ def downvote_topic(
 # DOCUMENT SYSTEM - Export, Create, Edit Documents
 # =============================================================================
 
-import uuid
+# Compiled documents keyed by topic slug - invalidated on every document write
+document_cache = TTLCache(ttl_seconds=60)
+
+
+def get_topic_with_document(db: Session, slug: str, for_update: bool = False):
+    """
+    Fetch a topic and its document (None if not created yet) in one query.
+
+    Writers pass for_update=True to lock the document row until commit, so
+    concurrent edits apply one after another instead of both starting from
+    the same version and silently dropping one of them.
+    """
+    if for_update:
+        # PostgreSQL can't lock the nullable side of an outer join, so try an
+        # inner join locking just the document; this is the only read when
+        # the document exists
+        row = db.query(Topic, TopicDocument).join(
+            TopicDocument, TopicDocument.topic_id == Topic.id
+        ).filter(Topic.slug == slug).with_for_update(of=TopicDocument).populate_existing().first()
+        if row:
+            return row
+
+    row = db.query(Topic, TopicDocument).outerjoin(
+        TopicDocument, TopicDocument.topic_id == Topic.id
+    ).filter(Topic.slug == slug).first()
+    if not row:
+        raise HTTPException(status_code=404, detail=f"Topic '{slug}' not found")
+    return row
 
 
 def generate_block_id():
     """Generate a unique block ID"""
-    return f"b_{uuid.uuid4().hex[:8]}"
+    # Same b_ + 8 hex format as before, without constructing a full UUID
+    return f"b_{os.urandom(4).hex()}"
+
+
+def build_document_blocks(raw_blocks: list) -> List[DocumentBlock]:
+    """
+    DocumentBlock objects for blocks loaded from the database.
+
+    Stored blocks were validated when they were written, so this uses
+    model_construct() and skips re-validating every block on each read.
+    """
+    return [DocumentBlock.model_construct(
+        id=b.get("id") or generate_block_id(),
+        type=b.get("type", "text"),
+        content=b.get("content", ""),
+        language=b.get("language"),
+        meta=b.get("meta") or {}
+    ) for b in raw_blocks]
+
+
+def build_document_response(topic: Topic, document: TopicDocument) -> DocumentResponse:
+    """DocumentResponse for a topic's document, shared by the read and write endpoints"""
+    return DocumentResponse.model_construct(
+        topic_id=topic.id,
+        topic_slug=topic.slug,
+        topic_title=topic.title,
+        blocks=build_document_blocks(document.blocks or []),
+        version=document.version,
+        format=document.format or "markdown",
+        created_by=document.created_by,
+        created_by_type=document.created_by_type,
+        last_edited_by=document.last_edited_by,
+        last_edited_by_type=document.last_edited_by_type,
+        created_at=document.created_at,
+        updated_at=document.updated_at
+    )
+
+
+def diff_blocks(old_blocks: list, new_blocks: list):
+    """
+    Delta that rebuilds old_blocks from new_blocks.
+
+    Revisions store this instead of a full copy of the previous blocks:
+    the block id order plus only the blocks that differ from the next
+    version. Falls back to a full snapshot if block ids are missing or
+    duplicated, since blocks are matched by id.
+    """
+    old_ids = [b.get("id") for b in old_blocks]
+    new_by_id = {b.get("id"): b for b in new_blocks}
+    if (None in old_ids or None in new_by_id
+            or len(set(old_ids)) != len(old_ids) or len(new_by_id) != len(new_blocks)):
+        return list(old_blocks)
+    return {
+        "order": old_ids,
+        "changed": {b["id"]: b for b in old_blocks if new_by_id.get(b["id"]) != b}
+    }
+
+
+def apply_block_diff(stored, new_blocks: list) -> list:
+    """Rebuild a revision's blocks from the blocks of the version after it"""
+    if isinstance(stored, list):
+        # Full snapshot (older revisions, or blocks without unique ids)
+        return stored
+    new_by_id = {b.get("id"): b for b in new_blocks}
+    changed = stored["changed"]
+    blocks = [changed[i] if i in changed else new_by_id.get(i) for i in stored["order"]]
+    return [b for b in blocks if b is not None]
+
+
+def rebuild_revisions(current_blocks: list, revisions):
+    """
+    Yield (revision, blocks) for revisions ordered newest-first.
+
+    Each revision is a delta against the version after it, so the walk
+    starts from the current document and must not skip any revision.
+    Writers therefore add the revision in the same transaction as the
+    document update rather than deferring it.
+    """
+    blocks = current_blocks or []
+    for revision in revisions:
+        blocks = apply_block_diff(revision.blocks or [], blocks)
+        yield revision, blocks
+
+
+def export_topic_header(topic: Topic) -> dict:
+    """Topic metadata included at the top of an export"""
+    return {
+        "id": topic.id,
+        "slug": topic.slug,
+        "title": topic.title,
+        "description": topic.description,
+        "created_by": topic.created_by,
+        "created_by_type": topic.created_by_type,
+        "categories": topic.category_names or [],
+        "created_at": topic.created_at.isoformat(),
+        "updated_at": topic.updated_at.isoformat()
+    }
 
 
 @app.get("/api/v1/topics/{slug}/export", response_model=TopicExport)
@@ -2220,84 +2622,68 @@ def export_topic_data(slug: str, db: Session = Depends(get_db)):
     # Get all contributions with threading info
     contributions = db.query(Contribution).filter(
         Contribution.topic_id == topic.id
-    ).order_by(Contribution.created_at).all()
-
-    contribution_responses = [ContributionResponse(
-        id=c.id,
-        topic_id=c.topic_id,
-        reply_to=c.reply_to,
-        content_type=c.content_type,
-        title=c.title,
-        content=c.content,
-        language=c.language,
-        file_url=c.file_url,
-        file_name=c.file_name,
-        extra_data=c.extra_data or {},
-        author=c.author,
-        author_type=c.author_type,
-        upvotes=c.upvotes or 0,
-        downvotes=c.downvotes or 0,
-        score=(c.upvotes or 0) - (c.downvotes or 0),
-        created_at=c.created_at,
-        updated_at=c.updated_at
-    ) for c in contributions]
+    ).order_by(Contribution.created_at, Contribution.id).all()
 
     return TopicExport(
-        topic={
-            "id": topic.id,
-            "slug": topic.slug,
-            "title": topic.title,
-            "description": topic.description,
-            "created_by": topic.created_by,
-            "created_by_type": topic.created_by_type,
-            "categories": [c.name for c in topic.categories],
-            "created_at": topic.created_at.isoformat(),
-            "updated_at": topic.updated_at.isoformat()
-        },
-        contributions=contribution_responses
+        topic=export_topic_header(topic),
+        contributions=[build_contribution_response(c) for c in contributions]
     )
 
 
-@app.get("/api/v1/topics/{slug}/document", response_model=DocumentResponse)
-def get_topic_document(slug: str, db: Session = Depends(get_db)):
+@app.get("/api/v1/topics/{slug}/export.ndjson")
+def export_topic_data_ndjson(slug: str, db: Session = Depends(get_db)):
     """
-    Get the compiled document for a topic.
-    Returns 404 if no document exists yet.
+    Stream a topic export as newline-delimited JSON.
+    The first line is the topic, followed by one contribution per line.
+    Memory use stays flat regardless of topic size - prefer this for large topics.
     """
     topic = db.query(Topic).filter(Topic.slug == slug).first()
     if not topic:
         raise HTTPException(status_code=404, detail=f"Topic '{slug}' not found")
 
-    document = db.query(TopicDocument).filter(TopicDocument.topic_id == topic.id).first()
-    if not document:
-        raise HTTPException(
-            status_code=404,
-            detail=f"No document exists for topic '{slug}'. Create one with POST /api/v1/topics/{slug}/document"
-        )
+    header = orjson.dumps(export_topic_header(topic)) + b"\n"
+    contributions = db.query(Contribution).filter(
+        Contribution.topic_id == topic.id
+    ).order_by(Contribution.created_at, Contribution.id)
 
-    # Parse blocks into DocumentBlock objects
-    blocks = [DocumentBlock(
-        id=b.get("id", generate_block_id()),
-        type=b.get("type", "text"),
-        content=b.get("content", ""),
-        language=b.get("language"),
-        meta=b.get("meta", {})
-    ) for b in (document.blocks or [])]
+    def generate():
+        yield header
+        for c in contributions.yield_per(CONTRIBUTION_STREAM_BATCH_SIZE):
+            yield build_contribution_response(c).model_dump_json().encode() + b"\n"
 
-    return DocumentResponse(
-        topic_id=topic.id,
-        topic_slug=topic.slug,
-        topic_title=topic.title,
-        blocks=blocks,
-        version=document.version,
-        format=document.format or "markdown",
-        created_by=document.created_by,
-        created_by_type=document.created_by_type,
-        last_edited_by=document.last_edited_by,
-        last_edited_by_type=document.last_edited_by_type,
-        created_at=document.created_at,
-        updated_at=document.updated_at
-    )
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@app.get("/api/v1/topics/{slug}/document", response_model=DocumentResponse)
+def get_topic_document(slug: str, request: Request, response: Response, db: Session = Depends(get_db)):
+    """
+    Get the compiled document for a topic.
+    Returns 404 if no document exists yet.
+    Send the ETag from a previous read as If-None-Match to get a 304 when unchanged.
+    """
+    document_response = document_cache.get(slug)
+    if document_response is not None:
+        version = document_response.version
+    else:
+        generation = document_cache.generation(slug)
+        topic, document = get_topic_with_document(db, slug)
+        if not document:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No document exists for topic '{slug}'. Create one with POST /api/v1/topics/{slug}/document"
+            )
+        version = document.version
+
+    # Every change bumps the version, so it identifies the document contents
+    etag = f'W/"{version}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    if document_response is None:
+        document_response = build_document_response(topic, document)
+        document_cache.set(slug, document_response, generation)
+    return document_response
 
 
 @app.post("/api/v1/topics/{slug}/document", response_model=DocumentResponse)
@@ -2315,9 +2701,7 @@ def create_or_replace_document(
     """
     user_or_agent, auth_type = require_auth(credentials, db)
 
-    topic = db.query(Topic).filter(Topic.slug == slug).first()
-    if not topic:
-        raise HTTPException(status_code=404, detail=f"Topic '{slug}' not found")
+    topic, existing_doc = get_topic_with_document(db, slug, for_update=True)
 
     author_name = user_or_agent.username if auth_type == "human" else user_or_agent.name
 
@@ -2335,14 +2719,12 @@ def create_or_replace_document(
         blocks_json.append(block_dict)
 
     # Check if document already exists
-    existing_doc = db.query(TopicDocument).filter(TopicDocument.topic_id == topic.id).first()
-
     if existing_doc:
         # Save current version as revision
         revision = TopicDocumentRevision(
             document_id=existing_doc.id,
             topic_id=topic.id,
-            blocks=existing_doc.blocks,
+            blocks=diff_blocks(existing_doc.blocks or [], blocks_json),
             version=existing_doc.version,
             edit_summary="Replaced entire document",
             edited_by=author_name,
@@ -2369,32 +2751,22 @@ def create_or_replace_document(
         )
         db.add(document)
 
+    # Flush returns the server timestamps (eager_defaults), so the response
+    # is built before commit instead of refreshing the document afterwards.
+    # There is no row to lock before the first document, so two concurrent
+    # creates race on the unique topic_id instead.
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        if not existing_doc and db.query(TopicDocument.id).filter(TopicDocument.topic_id == topic.id).first():
+            raise HTTPException(status_code=409, detail=f"A document for topic '{slug}' was just created, retry to replace it")
+        raise
+
+    response = build_document_response(topic, document)
     db.commit()
-    db.refresh(document)
-
-    # Parse blocks back to DocumentBlock objects
-    blocks = [DocumentBlock(
-        id=b.get("id"),
-        type=b.get("type", "text"),
-        content=b.get("content", ""),
-        language=b.get("language"),
-        meta=b.get("meta", {})
-    ) for b in document.blocks]
-
-    return DocumentResponse(
-        topic_id=topic.id,
-        topic_slug=topic.slug,
-        topic_title=topic.title,
-        blocks=blocks,
-        version=document.version,
-        format=document.format,
-        created_by=document.created_by,
-        created_by_type=document.created_by_type,
-        last_edited_by=document.last_edited_by,
-        last_edited_by_type=document.last_edited_by_type,
-        created_at=document.created_at,
-        updated_at=document.updated_at
-    )
+    document_cache.delete(slug)
+    return response
 
 
 @app.patch("/api/v1/topics/{slug}/document", response_model=DocumentResponse)
@@ -2410,11 +2782,7 @@ def edit_document(
     """
     user_or_agent, auth_type = require_auth(credentials, db)
 
-    topic = db.query(Topic).filter(Topic.slug == slug).first()
-    if not topic:
-        raise HTTPException(status_code=404, detail=f"Topic '{slug}' not found")
-
-    document = db.query(TopicDocument).filter(TopicDocument.topic_id == topic.id).first()
+    topic, document = get_topic_with_document(db, slug, for_update=True)
     if not document:
         raise HTTPException(
             status_code=404,
@@ -2423,43 +2791,43 @@ def edit_document(
 
     author_name = user_or_agent.username if auth_type == "human" else user_or_agent.name
 
-    # Save current version as revision before editing
-    revision = TopicDocumentRevision(
-        document_id=document.id,
-        topic_id=topic.id,
-        blocks=document.blocks,
-        version=document.version,
-        edit_summary=patch_data.edit_summary or "Edited document",
-        edited_by=author_name,
-        edited_by_type=auth_type
-    )
-    db.add(revision)
-
-    # Work with a copy of blocks
+    # Shallow copy: only the list is copied, block dicts stay shared until a
+    # replace copies the one it changes. The untouched pre-edit list is
+    # needed to diff the revision, so blocks aren't mutated in place.
     blocks = list(document.blocks or [])
 
+    def index_blocks():
+        # First occurrence wins if ids are ever duplicated
+        index = {}
+        for i, b in enumerate(blocks):
+            index.setdefault(b.get("id"), i)
+        return index
+
+    # Block id -> position; only rebuilt after structural changes (delete/insert)
+    block_index = index_blocks()
+
     # Process edits (replace, delete)
     for edit in (patch_data.edits or []):
-        block_idx = None
-        for i, b in enumerate(blocks):
-            if b.get("id") == edit.block_id:
-                block_idx = i
-                break
+        block_idx = block_index.get(edit.block_id)
 
         if block_idx is None:
             raise HTTPException(status_code=400, detail=f"Block '{edit.block_id}' not found")
 
         if edit.action == "delete":
             blocks.pop(block_idx)
+            block_index = index_blocks()
         elif edit.action == "replace":
+            # Copy the block so the stored (pre-edit) blocks stay untouched
+            block = dict(blocks[block_idx])
             if edit.content is not None:
-                blocks[block_idx]["content"] = edit.content
+                block["content"] = edit.content
             if edit.type is not None:
-                blocks[block_idx]["type"] = edit.type
+                block["type"] = edit.type
             if edit.language is not None:
-                blocks[block_idx]["language"] = edit.language
+                block["language"] = edit.language
             if edit.meta is not None:
-                blocks[block_idx]["meta"] = edit.meta
+                block["meta"] = edit.meta
+            blocks[block_idx] = block
 
     # Process inserts
     for insert in (patch_data.inserts or []):
@@ -2477,81 +2845,159 @@ def edit_document(
             blocks.insert(0, new_block)
         else:
             # Find the block to insert after
-            insert_idx = None
-            for i, b in enumerate(blocks):
-                if b.get("id") == insert.after:
-                    insert_idx = i + 1
-                    break
+            after_idx = block_index.get(insert.after)
 
-            if insert_idx is None:
+            if after_idx is None:
                 raise HTTPException(status_code=400, detail=f"Block '{insert.after}' not found for insert")
 
-            blocks.insert(insert_idx, new_block)
+            blocks.insert(after_idx + 1, new_block)
+        block_index = index_blocks()
 
-    # Update document
-    document.blocks = blocks
-    document.version = document.version + 1
-    document.last_edited_by = author_name
-    document.last_edited_by_type = auth_type
+    # No-op edits (nothing given, or replacing with identical content) keep
+    # the current version and don't record a revision
+    if blocks != (document.blocks or []):
+        # Save current version as revision
+        revision = TopicDocumentRevision(
+            document_id=document.id,
+            topic_id=topic.id,
+            blocks=diff_blocks(document.blocks or [], blocks),
+            version=document.version,
+            edit_summary=patch_data.edit_summary or "Edited document",
+            edited_by=author_name,
+            edited_by_type=auth_type
+        )
+        db.add(revision)
+
+        # Update document
+        document.blocks = blocks
+        document.version = document.version + 1
+        document.last_edited_by = author_name
+        document.last_edited_by_type = auth_type
 
+    # Flush returns the server timestamps (eager_defaults), so the response
+    # is built before commit instead of refreshing the document afterwards
+    db.flush()
+
+    response = build_document_response(topic, document)
     db.commit()
-    db.refresh(document)
+    document_cache.delete(slug)
+    return response
 
-    # Parse blocks back to DocumentBlock objects
-    block_responses = [DocumentBlock(
-        id=b.get("id"),
-        type=b.get("type", "text"),
-        content=b.get("content", ""),
-        language=b.get("language"),
-        meta=b.get("meta", {})
-    ) for b in document.blocks]
 
-    return DocumentResponse(
-        topic_id=topic.id,
-        topic_slug=topic.slug,
-        topic_title=topic.title,
-        blocks=block_responses,
-        version=document.version,
-        format=document.format,
-        created_by=document.created_by,
-        created_by_type=document.created_by_type,
-        last_edited_by=document.last_edited_by,
-        last_edited_by_type=document.last_edited_by_type,
-        created_at=document.created_at,
-        updated_at=document.updated_at
-    )
+# Revision rows fetched per batch when rebuilding a document version
+REVISION_BATCH_SIZE = 100
+
+
+def rebuild_document_version(db: Session, document: TopicDocument, version: int):
+    """
+    (revision, blocks) for one earlier version of a document.
+
+    Every delta from the current version back to the target has to be
+    applied, so revisions are streamed in batches and only the last rebuilt
+    version is kept.
+    """
+    revisions = db.query(TopicDocumentRevision).filter(
+        TopicDocumentRevision.document_id == document.id,
+        TopicDocumentRevision.version >= version
+    ).order_by(
+        TopicDocumentRevision.version.desc(), TopicDocumentRevision.id.desc()
+    ).yield_per(REVISION_BATCH_SIZE)
+
+    rebuilt = None
+    for rebuilt in rebuild_revisions(document.blocks, revisions):
+        pass
+
+    if rebuilt is None or rebuilt[0].version != version:
+        raise HTTPException(status_code=404, detail=f"Version {version} not found")
+    return rebuilt
 
 
 @app.get("/api/v1/topics/{slug}/document/history", response_model=List[DocumentRevisionResponse])
-def get_document_history(slug: str, limit: int = 20, db: Session = Depends(get_db)):
-    """Get version history of a topic's document."""
-    topic = db.query(Topic).filter(Topic.slug == slug).first()
-    if not topic:
-        raise HTTPException(status_code=404, detail=f"Topic '{slug}' not found")
+def get_document_history(
+    slug: str,
+    request: Request,
+    response: Response,
+    limit: int = 20,
+    include_blocks: bool = True,
+    db: Session = Depends(get_db)
+):
+    """
+    Get version history of a topic's document.
 
-    document = db.query(TopicDocument).filter(TopicDocument.topic_id == topic.id).first()
+    Pass include_blocks=false to list versions without their content, then
+    fetch the one you need from /document/history/{version}.
+    """
+    topic, document = get_topic_with_document(db, slug)
     if not document:
         raise HTTPException(status_code=404, detail=f"No document exists for topic '{slug}'")
 
+    # History only changes when the document version does
+    etag = f'W/"{document.version}-{limit}{"" if include_blocks else "-meta"}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    if not include_blocks:
+        # Metadata only - the blocks column isn't even selected
+        revisions = db.query(
+            TopicDocumentRevision.id,
+            TopicDocumentRevision.version,
+            TopicDocumentRevision.edit_summary,
+            TopicDocumentRevision.edited_by,
+            TopicDocumentRevision.edited_by_type,
+            TopicDocumentRevision.created_at
+        ).filter(
+            TopicDocumentRevision.document_id == document.id
+        ).order_by(
+            TopicDocumentRevision.version.desc(), TopicDocumentRevision.id.desc()
+        ).limit(limit).all()
+
+        return [DocumentRevisionResponse.model_construct(
+            id=r.id,
+            version=r.version,
+            blocks=None,
+            edit_summary=r.edit_summary,
+            edited_by=r.edited_by,
+            edited_by_type=r.edited_by_type,
+            created_at=r.created_at
+        ) for r in revisions]
+
+    # Newest-first by version so each delta is applied to the version after it
     revisions = db.query(TopicDocumentRevision).filter(
         TopicDocumentRevision.document_id == document.id
-    ).order_by(TopicDocumentRevision.created_at.desc()).limit(limit).all()
+    ).order_by(
+        TopicDocumentRevision.version.desc(), TopicDocumentRevision.id.desc()
+    ).limit(limit).all()
 
-    return [DocumentRevisionResponse(
+    return [DocumentRevisionResponse.model_construct(
         id=r.id,
         version=r.version,
-        blocks=[DocumentBlock(
-            id=b.get("id", ""),
-            type=b.get("type", "text"),
-            content=b.get("content", ""),
-            language=b.get("language"),
-            meta=b.get("meta", {})
-        ) for b in (r.blocks or [])],
+        blocks=build_document_blocks(blocks),
         edit_summary=r.edit_summary,
         edited_by=r.edited_by,
         edited_by_type=r.edited_by_type,
         created_at=r.created_at
-    ) for r in revisions]
+    ) for r, blocks in rebuild_revisions(document.blocks, revisions)]
+
+
+@app.get("/api/v1/topics/{slug}/document/history/{version}", response_model=DocumentRevisionResponse)
+def get_document_version(slug: str, version: int, db: Session = Depends(get_db)):
+    """Get a single earlier version of a topic's document, with its blocks."""
+    topic, document = get_topic_with_document(db, slug)
+    if not document:
+        raise HTTPException(status_code=404, detail=f"No document exists for topic '{slug}'")
+
+    revision, blocks = rebuild_document_version(db, document, version)
+
+    return DocumentRevisionResponse.model_construct(
+        id=revision.id,
+        version=revision.version,
+        blocks=build_document_blocks(blocks),
+        edit_summary=revision.edit_summary,
+        edited_by=revision.edited_by,
+        edited_by_type=revision.edited_by_type,
+        created_at=revision.created_at
+    )
 
 
 @app.post("/api/v1/topics/{slug}/document/revert/{version}")
@@ -2564,22 +3010,11 @@ def revert_document(
     """Revert document to a previous version."""
     user_or_agent, auth_type = require_auth(credentials, db)
 
-    topic = db.query(Topic).filter(Topic.slug == slug).first()
-    if not topic:
-        raise HTTPException(status_code=404, detail=f"Topic '{slug}' not found")
-
-    document = db.query(TopicDocument).filter(TopicDocument.topic_id == topic.id).first()
+    topic, document = get_topic_with_document(db, slug, for_update=True)
     if not document:
         raise HTTPException(status_code=404, detail=f"No document exists for topic '{slug}'")
 
-    # Find the revision to revert to
-    revision = db.query(TopicDocumentRevision).filter(
-        TopicDocumentRevision.document_id == document.id,
-        TopicDocumentRevision.version == version
-    ).first()
-
-    if not revision:
-        raise HTTPException(status_code=404, detail=f"Version {version} not found")
+    _, reverted_blocks = rebuild_document_version(db, document, version)
 
     author_name = user_or_agent.username if auth_type == "human" else user_or_agent.name
 
@@ -2587,7 +3022,7 @@ def revert_document(
     current_revision = TopicDocumentRevision(
         document_id=document.id,
         topic_id=topic.id,
-        blocks=document.blocks,
+        blocks=diff_blocks(document.blocks or [], reverted_blocks),
         version=document.version,
         edit_summary=f"Before revert to version {version}",
         edited_by=author_name,
@@ -2596,12 +3031,13 @@ def revert_document(
     db.add(current_revision)
 
     # Revert
-    document.blocks = revision.blocks
+    document.blocks = reverted_blocks
     document.version = document.version + 1
     document.last_edited_by = author_name
     document.last_edited_by_type = auth_type
 
     db.commit()
+    document_cache.delete(slug)
 
     return {
         "success": True,
@@ -2613,6 +3049,47 @@ def revert_document(
 
 # === DEVELOPMENT REQUESTS ===
 
+def query_dev_request_rows(db: Session):
+    """
+    Query for dev request rows joined with their topic's slug and title.
+
+    Read endpoints use this instead of loading DevRequest entities and then
+    looking up each topic, so a list is one query returning plain rows.
+    """
+    return db.query(
+        *DevRequest.__table__.c,
+        Topic.slug.label("topic_slug"),
+        Topic.title.label("topic_title")
+    ).outerjoin(Topic, Topic.id == DevRequest.topic_id)
+
+
+def build_dev_request_response(r) -> DevRequestResponse:
+    """Build the API representation of a row from query_dev_request_rows()"""
+    return DevRequestResponse.model_construct(
+        id=r.id,
+        topic_id=r.topic_id,
+        topic_slug=r.topic_slug,
+        topic_title=r.topic_title,
+        title=r.title,
+        description=r.description,
+        priority=r.priority,
+        request_type=r.request_type,
+        status=r.status,
+        requested_by=r.requested_by,
+        requested_by_type=r.requested_by_type,
+        implemented_by=r.implemented_by,
+        implemented_by_type=r.implemented_by_type,
+        implemented_at=r.implemented_at,
+        implementation_notes=r.implementation_notes,
+        git_commit=r.git_commit,
+        upvotes=r.upvotes or 0,
+        downvotes=r.downvotes or 0,
+        score=(r.upvotes or 0) - (r.downvotes or 0),
+        created_at=r.created_at,
+        updated_at=r.updated_at
+    )
+
+
 @app.post("/api/v1/topics/{slug}/dev-requests", response_model=DevRequestResponse)
 @limiter.limit("20/minute")
 def create_dev_request(
@@ -2694,7 +3171,7 @@ def list_dev_requests(
     if not topic:
         raise HTTPException(status_code=404, detail=f"Topic '{slug}' not found")
 
-    query = db.query(DevRequest).filter(DevRequest.topic_id == topic.id)
+    query = query_dev_request_rows(db).filter(DevRequest.topic_id == topic.id)
 
     if status:
         query = query.filter(DevRequest.status == status)
@@ -2710,32 +3187,7 @@ def list_dev_requests(
         DevRequest.created_at.desc()
     ).all()
 
-    return [
-        DevRequestResponse(
-            id=r.id,
-            topic_id=r.topic_id,
-            topic_slug=topic.slug,
-            topic_title=topic.title,
-            title=r.title,
-            description=r.description,
-            priority=r.priority,
-            request_type=r.request_type,
-            status=r.status,
-            requested_by=r.requested_by,
-            requested_by_type=r.requested_by_type,
-            implemented_by=r.implemented_by,
-            implemented_by_type=r.implemented_by_type,
-            implemented_at=r.implemented_at,
-            implementation_notes=r.implementation_notes,
-            git_commit=r.git_commit,
-            upvotes=r.upvotes or 0,
-            downvotes=r.downvotes or 0,
-            score=(r.upvotes or 0) - (r.downvotes or 0),
-            created_at=r.created_at,
-            updated_at=r.updated_at
-        )
-        for r in requests
-    ]
+    return [build_dev_request_response(r) for r in requests]
 
 
 @app.get("/api/v1/dev-requests", response_model=List[DevRequestResponse])
@@ -2758,7 +3210,7 @@ def list_all_dev_requests(
 
     Sort options: score (default), recent, priority
     """
-    query = db.query(DevRequest)
+    query = query_dev_request_rows(db)
 
     if status:
         query = query.filter(DevRequest.status == status)
@@ -2767,9 +3219,7 @@ def list_all_dev_requests(
     if request_type:
         query = query.filter(DevRequest.request_type == request_type)
     if topic_slug:
-        topic = db.query(Topic).filter(Topic.slug == topic_slug).first()
-        if topic:
-            query = query.filter(DevRequest.topic_id == topic.id)
+        query = query.filter(Topic.slug == topic_slug)
 
     # Sort options
     if sort == "recent":
@@ -2787,34 +3237,7 @@ def list_all_dev_requests(
 
     requests = query.offset(offset).limit(limit).all()
 
-    result = []
-    for r in requests:
-        topic = db.query(Topic).filter(Topic.id == r.topic_id).first()
-        result.append(DevRequestResponse(
-            id=r.id,
-            topic_id=r.topic_id,
-            topic_slug=topic.slug if topic else None,
-            topic_title=topic.title if topic else None,
-            title=r.title,
-            description=r.description,
-            priority=r.priority,
-            request_type=r.request_type,
-            status=r.status,
-            requested_by=r.requested_by,
-            requested_by_type=r.requested_by_type,
-            implemented_by=r.implemented_by,
-            implemented_by_type=r.implemented_by_type,
-            implemented_at=r.implemented_at,
-            implementation_notes=r.implementation_notes,
-            git_commit=r.git_commit,
-            upvotes=r.upvotes or 0,
-            downvotes=r.downvotes or 0,
-            score=(r.upvotes or 0) - (r.downvotes or 0),
-            created_at=r.created_at,
-            updated_at=r.updated_at
-        ))
-
-    return result
+    return [build_dev_request_response(r) for r in requests]
 
 
 @app.get("/api/v1/dev-requests/pending", response_model=List[DevRequestResponse])
@@ -2829,7 +3252,7 @@ def list_all_pending_requests(
     This is useful for the coding agent to find work to do.
     Sorted by priority and score.
     """
-    query = db.query(DevRequest).filter(DevRequest.status == "pending")
+    query = query_dev_request_rows(db).filter(DevRequest.status == "pending")
 
     if priority:
         query = query.filter(DevRequest.priority == priority)
@@ -2841,34 +3264,7 @@ def list_all_pending_requests(
         DevRequest.created_at.asc()
     ).limit(limit).all()
 
-    result = []
-    for r in requests:
-        topic = db.query(Topic).filter(Topic.id == r.topic_id).first()
-        result.append(DevRequestResponse(
-            id=r.id,
-            topic_id=r.topic_id,
-            topic_slug=topic.slug if topic else None,
-            topic_title=topic.title if topic else None,
-            title=r.title,
-            description=r.description,
-            priority=r.priority,
-            request_type=r.request_type,
-            status=r.status,
-            requested_by=r.requested_by,
-            requested_by_type=r.requested_by_type,
-            implemented_by=r.implemented_by,
-            implemented_by_type=r.implemented_by_type,
-            implemented_at=r.implemented_at,
-            implementation_notes=r.implementation_notes,
-            git_commit=r.git_commit,
-            upvotes=r.upvotes or 0,
-            downvotes=r.downvotes or 0,
-            score=(r.upvotes or 0) - (r.downvotes or 0),
-            created_at=r.created_at,
-            updated_at=r.updated_at
-        ))
-
-    return result
+    return [build_dev_request_response(r) for r in requests]
 
 
 @app.get("/api/v1/dev-requests/{request_id}", response_model=DevRequestResponse)
@@ -2879,35 +3275,11 @@ def get_dev_request(
     """
     Get a single development request by ID.
     """
-    dev_req = db.query(DevRequest).filter(DevRequest.id == request_id).first()
-    if not dev_req:
+    row = query_dev_request_rows(db).filter(DevRequest.id == request_id).first()
+    if not row:
         raise HTTPException(status_code=404, detail=f"Dev request {request_id} not found")
 
-    topic = db.query(Topic).filter(Topic.id == dev_req.topic_id).first()
-
-    return DevRequestResponse(
-        id=dev_req.id,
-        topic_id=dev_req.topic_id,
-        topic_slug=topic.slug if topic else None,
-        topic_title=topic.title if topic else None,
-        title=dev_req.title,
-        description=dev_req.description,
-        priority=dev_req.priority,
-        request_type=dev_req.request_type,
-        status=dev_req.status,
-        requested_by=dev_req.requested_by,
-        requested_by_type=dev_req.requested_by_type,
-        implemented_by=dev_req.implemented_by,
-        implemented_by_type=dev_req.implemented_by_type,
-        implemented_at=dev_req.implemented_at,
-        implementation_notes=dev_req.implementation_notes,
-        git_commit=dev_req.git_commit,
-        upvotes=dev_req.upvotes or 0,
-        downvotes=dev_req.downvotes or 0,
-        score=(dev_req.upvotes or 0) - (dev_req.downvotes or 0),
-        created_at=dev_req.created_at,
-        updated_at=dev_req.updated_at
-    )
+    return build_dev_request_response(row)
 
 
 @app.patch("/api/v1/dev-requests/{request_id}")
@@ -2993,16 +3365,13 @@ def upvote_dev_request(
     """Upvote a development request to increase its priority"""
     user_or_agent, auth_type = require_auth(credentials, db)
 
-    dev_req = db.query(DevRequest).filter(DevRequest.id == request_id).first()
-    if not dev_req:
+    score = record_vote(db, DevRequest, DevRequest.id == request_id, upvote=True)
+    if score is None:
         raise HTTPException(status_code=404, detail="Development request not found")
 
-    dev_req.upvotes = (dev_req.upvotes or 0) + 1
-    db.commit()
-
     return {
         "success": True,
-        "score": (dev_req.upvotes or 0) - (dev_req.downvotes or 0)
+        "score": score
     }
 
 
@@ -3017,16 +3386,13 @@ def downvote_dev_request(
     """Downvote a development request"""
     user_or_agent, auth_type = require_auth(credentials, db)
 
-    dev_req = db.query(DevRequest).filter(DevRequest.id == request_id).first()
-    if not dev_req:
+    score = record_vote(db, DevRequest, DevRequest.id == request_id, upvote=False)
+    if score is None:
         raise HTTPException(status_code=404, detail="Development request not found")
 
-    dev_req.downvotes = (dev_req.downvotes or 0) + 1
-    db.commit()
-
     return {
         "success": True,
-        "score": (dev_req.upvotes or 0) - (dev_req.downvotes or 0)
+        "score": score
     }
 
 
@@ -3070,8 +3436,7 @@ def require_dev_agent(
     if not credentials:
         raise HTTPException(status_code=401, detail="API key required")
 
-    api_key = credentials.credentials
-    agent = db.query(Agent).filter(Agent.api_key == api_key).first()
+    agent = get_agent_by_api_key(credentials.credentials, db)
 
     if not agent:
         raise HTTPException(status_code=401, detail="Invalid API key")
@@ -3119,7 +3484,6 @@ async def create_dev_task(
     )
 
     # Run task in background
-    import asyncio
     asyncio.create_task(run_claude_task(task))
 
     return DevTaskResponse(
@@ -0,0 +1,62 @@
+"""Store hashed session tokens
+
+Revision ID: 004_hash_session_tokens
+Revises: 003_remove_articles
+Create Date: 2026-10-16
+
+This migration replaces the plaintext user_sessions.token column with
+token_hash (SHA-256 of the token). Existing sessions are hashed in place
+so logged-in users stay logged in. The lookup index only covers active
+sessions since every lookup filters on is_active.
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '004_hash_session_tokens'
+down_revision: Union[str, None] = '003_remove_articles'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Hash existing session tokens and index active sessions by hash."""
+    op.add_column('user_sessions', sa.Column('token_hash', sa.String(), nullable=True))
+
+    conn = op.get_bind()
+    sessions = conn.execute(sa.text("SELECT id, token FROM user_sessions")).fetchall()
+    for session_id, token in sessions:
+        conn.execute(
+            sa.text("UPDATE user_sessions SET token_hash = :token_hash WHERE id = :id"),
+            {"token_hash": hashlib.sha256(token.encode()).hexdigest(), "id": session_id}
+        )
+
+    op.drop_index(op.f('ix_user_sessions_token'), table_name='user_sessions')
+    with op.batch_alter_table('user_sessions') as batch_op:
+        batch_op.alter_column('token_hash', existing_type=sa.String(), nullable=False)
+        batch_op.drop_column('token')
+
+    op.create_index(
+        'ix_user_sessions_token_hash_active', 'user_sessions', ['token_hash'], unique=True,
+        postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active')
+    )
+
+
+def downgrade() -> None:
+    """Restore the plaintext token column.
+
+    Hashes cannot be reversed, so all existing sessions are deactivated
+    and users will need to log in again.
+    """
+    op.drop_index('ix_user_sessions_token_hash_active', table_name='user_sessions')
+    op.add_column('user_sessions', sa.Column('token', sa.String(), nullable=True))
+    op.execute("UPDATE user_sessions SET token = token_hash, is_active = false")
+
+    with op.batch_alter_table('user_sessions') as batch_op:
+        batch_op.alter_column('token', existing_type=sa.String(), nullable=False)
+        batch_op.drop_column('token_hash')
+
+    op.create_index(op.f('ix_user_sessions_token'), 'user_sessions', ['token'], unique=True)
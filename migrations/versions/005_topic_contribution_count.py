@@ -0,0 +1,36 @@
+"""Add cached contribution_count to topics
+
+Revision ID: 005_topic_contribution_count
+Revises: 004_hash_session_tokens
+Create Date: 2026-10-16
+
+This migration adds a denormalized topics.contribution_count column so
+topic listings no longer need to count contributions on every read.
+Existing rows are backfilled from the contributions table.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '005_topic_contribution_count'
+down_revision: Union[str, None] = '004_hash_session_tokens'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add and backfill topics.contribution_count."""
+    op.add_column('topics', sa.Column('contribution_count', sa.Integer(), nullable=False, server_default='0'))
+    op.execute("""
+        UPDATE topics SET contribution_count = (
+            SELECT COUNT(*) FROM contributions WHERE contributions.topic_id = topics.id
+        )
+    """)
+
+
+def downgrade() -> None:
+    """Remove topics.contribution_count."""
+    with op.batch_alter_table('topics') as batch_op:
+        batch_op.drop_column('contribution_count')
@@ -0,0 +1,49 @@
+"""Store document blocks as JSONB
+
+Revision ID: 006_document_blocks_jsonb
+Revises: 005_topic_contribution_count
+Create Date: 2026-10-16
+
+This migration converts topic_documents.blocks and
+topic_document_revisions.blocks from JSON to JSONB on PostgreSQL.
+SQLite has no JSONB type, so it is a no-op there.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = '006_document_blocks_jsonb'
+down_revision: Union[str, None] = '005_topic_contribution_count'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['topic_documents', 'topic_document_revisions']
+
+
+def upgrade() -> None:
+    """Convert blocks columns to JSONB."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table in TABLES:
+        op.alter_column(
+            table, 'blocks',
+            type_=postgresql.JSONB(),
+            existing_type=sa.JSON(),
+            postgresql_using='blocks::jsonb'
+        )
+
+
+def downgrade() -> None:
+    """Convert blocks columns back to JSON."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table in TABLES:
+        op.alter_column(
+            table, 'blocks',
+            type_=sa.JSON(),
+            existing_type=postgresql.JSONB(),
+            postgresql_using='blocks::json'
+        )
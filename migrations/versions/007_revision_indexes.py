@@ -0,0 +1,37 @@
+"""Add composite indexes on topic_document_revisions
+
+Revision ID: 007_revision_indexes
+Revises: 006_document_blocks_jsonb
+Create Date: 2026-10-16
+
+This migration adds (document_id, created_at DESC) for the history
+endpoint and (document_id, version) for revert lookups.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '007_revision_indexes'
+down_revision: Union[str, None] = '006_document_blocks_jsonb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add revision lookup indexes."""
+    op.create_index(
+        'ix_topic_document_revisions_document_created', 'topic_document_revisions',
+        ['document_id', sa.text('created_at DESC')], unique=False
+    )
+    op.create_index(
+        'ix_topic_document_revisions_document_version', 'topic_document_revisions',
+        ['document_id', 'version'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Remove revision lookup indexes."""
+    op.drop_index('ix_topic_document_revisions_document_version', table_name='topic_document_revisions')
+    op.drop_index('ix_topic_document_revisions_document_created', table_name='topic_document_revisions')
@@ -0,0 +1,54 @@
+"""Add cached category_names to topics
+
+Revision ID: 008_topic_category_names
+Revises: 007_revision_indexes
+Create Date: 2026-10-16
+
+This migration adds a denormalized topics.category_names column so topic
+reads and exports can return category names without joining
+topic_categories. Existing rows are backfilled from topic_categories.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = '008_topic_category_names'
+down_revision: Union[str, None] = '007_revision_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+json_type = sa.JSON().with_variant(postgresql.JSONB(), 'postgresql')
+
+
+def upgrade() -> None:
+    """Add and backfill topics.category_names."""
+    op.add_column('topics', sa.Column('category_names', json_type, nullable=False, server_default='[]'))
+
+    # topic_categories has no key yet and may hold duplicate links, so each
+    # name is aggregated once, in name order
+    if op.get_context().dialect.name == 'postgresql':
+        names = """
+            SELECT jsonb_agg(DISTINCT category_name ORDER BY category_name) FROM topic_categories
+            WHERE topic_categories.topic_id = topics.id
+        """
+    else:
+        names = """
+            SELECT json_group_array(category_name) FROM (
+                SELECT DISTINCT category_name FROM topic_categories
+                WHERE topic_categories.topic_id = topics.id
+                ORDER BY category_name
+            )
+        """
+    op.execute(f"""
+        UPDATE topics SET category_names = ({names})
+        WHERE id IN (SELECT topic_id FROM topic_categories)
+    """)
+
+
+def downgrade() -> None:
+    """Remove topics.category_names."""
+    with op.batch_alter_table('topics') as batch_op:
+        batch_op.drop_column('category_names')
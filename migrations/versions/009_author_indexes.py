@@ -0,0 +1,38 @@
+"""Add author indexes for public profiles
+
+Revision ID: 009_author_indexes
+Revises: 008_topic_category_names
+Create Date: 2026-10-16
+
+This migration adds (created_by, created_by_type, created_at DESC) on
+topics and (author, author_type, created_at DESC) on contributions, the
+filters and sort order used by the user and agent profile endpoints.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '009_author_indexes'
+down_revision: Union[str, None] = '008_topic_category_names'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add profile lookup indexes."""
+    op.create_index(
+        'ix_topics_created_by_created', 'topics',
+        ['created_by', 'created_by_type', sa.text('created_at DESC')], unique=False
+    )
+    op.create_index(
+        'ix_contributions_author_created', 'contributions',
+        ['author', 'author_type', sa.text('created_at DESC')], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Remove profile lookup indexes."""
+    op.drop_index('ix_contributions_author_created', table_name='contributions')
+    op.drop_index('ix_topics_created_by_created', table_name='topics')
@@ -0,0 +1,46 @@
+"""Add trigram indexes for topic search
+
+Revision ID: 010_topic_search_trgm
+Revises: 009_author_indexes
+Create Date: 2026-10-16
+
+Search matches ILIKE '%term%' on topics.title and topics.description,
+which a btree index can't serve. On PostgreSQL this migration enables
+pg_trgm and adds GIN trigram indexes so those ILIKE filters use an index
+scan instead of reading every topic. SQLite (local development) is left
+unchanged.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '010_topic_search_trgm'
+down_revision: Union[str, None] = '009_author_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add trigram indexes on topic title and description (PostgreSQL only)."""
+    if op.get_context().dialect.name != 'postgresql':
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_topics_title_trgm', 'topics', ['title'],
+        postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_topics_description_trgm', 'topics', ['description'],
+        postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Remove the trigram indexes (the pg_trgm extension is left installed)."""
+    if op.get_context().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_topics_description_trgm', table_name='topics')
+    op.drop_index('ix_topics_title_trgm', table_name='topics')
@@ -0,0 +1,58 @@
+"""Store hashed agent API keys
+
+Revision ID: 011_hash_api_keys
+Revises: 010_topic_search_trgm
+Create Date: 2026-10-16
+
+This migration replaces the plaintext agents.api_key column with
+api_key_hash (SHA-256 of the key), matching how session tokens are stored.
+Existing keys are hashed in place so registered agents keep working.
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '011_hash_api_keys'
+down_revision: Union[str, None] = '010_topic_search_trgm'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Hash existing API keys and index agents by key hash."""
+    op.add_column('agents', sa.Column('api_key_hash', sa.String(), nullable=True))
+
+    conn = op.get_bind()
+    agents = conn.execute(sa.text("SELECT id, api_key FROM agents")).fetchall()
+    for agent_id, api_key in agents:
+        conn.execute(
+            sa.text("UPDATE agents SET api_key_hash = :api_key_hash WHERE id = :id"),
+            {"api_key_hash": hashlib.sha256(api_key.encode()).hexdigest(), "id": agent_id}
+        )
+
+    op.drop_index(op.f('ix_agents_api_key'), table_name='agents')
+    with op.batch_alter_table('agents') as batch_op:
+        batch_op.alter_column('api_key_hash', existing_type=sa.String(), nullable=False)
+        batch_op.drop_column('api_key')
+
+    op.create_index(op.f('ix_agents_api_key_hash'), 'agents', ['api_key_hash'], unique=True)
+
+
+def downgrade() -> None:
+    """Restore the plaintext api_key column.
+
+    Hashes cannot be reversed, so the column is filled with the hash values
+    and agents will need to be issued new keys.
+    """
+    op.drop_index(op.f('ix_agents_api_key_hash'), table_name='agents')
+    op.add_column('agents', sa.Column('api_key', sa.String(), nullable=True))
+    op.execute("UPDATE agents SET api_key = api_key_hash")
+
+    with op.batch_alter_table('agents') as batch_op:
+        batch_op.alter_column('api_key', existing_type=sa.String(), nullable=False)
+        batch_op.drop_column('api_key_hash')
+
+    op.create_index(op.f('ix_agents_api_key'), 'agents', ['api_key'], unique=True)
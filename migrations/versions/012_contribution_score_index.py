@@ -0,0 +1,34 @@
+"""Add score index for topic contributions
+
+Revision ID: 012_contribution_score_index
+Revises: 011_hash_api_keys
+Create Date: 2026-10-16
+
+This migration adds an expression index on contributions
+(topic_id, (upvotes - downvotes) DESC), matching the default "top" sort of
+the topic contributions endpoint so rows are read in order instead of being
+sorted on every request.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '012_contribution_score_index'
+down_revision: Union[str, None] = '011_hash_api_keys'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the contribution score index."""
+    op.create_index(
+        'ix_contributions_topic_score', 'contributions',
+        ['topic_id', sa.text('(upvotes - downvotes) DESC')], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Remove the contribution score index."""
+    op.drop_index('ix_contributions_topic_score', table_name='contributions')
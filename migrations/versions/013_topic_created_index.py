@@ -0,0 +1,34 @@
+"""Add created_at index for topic listings
+
+Revision ID: 013_topic_created_index
+Revises: 012_contribution_score_index
+Create Date: 2026-10-16
+
+This migration adds a descending index on topics (created_at, id). The
+topic list orders by created_at DESC, id DESC with a LIMIT by default (id
+breaks ties for the after_id cursor), which otherwise scans and sorts the
+whole table.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '013_topic_created_index'
+down_revision: Union[str, None] = '012_contribution_score_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the topic created_at index."""
+    op.create_index(
+        'ix_topics_created_at', 'topics',
+        [sa.text('created_at DESC'), sa.text('id DESC')], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Remove the topic created_at index."""
+    op.drop_index('ix_topics_created_at', table_name='topics')
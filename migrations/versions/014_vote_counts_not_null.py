@@ -0,0 +1,62 @@
+"""Make vote counters NOT NULL with a server default
+
+Revision ID: 014_vote_counts_not_null
+Revises: 013_topic_created_index
+Create Date: 2026-10-16
+
+The upvotes/downvotes columns on topics, contributions and dev_requests
+were nullable with only a Python-side default, so every vote had to
+COALESCE the counter. This migration zeroes any NULL counters and makes the
+columns NOT NULL DEFAULT 0 so votes can increment them directly.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '014_vote_counts_not_null'
+down_revision: Union[str, None] = '013_topic_created_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VOTE_TABLES = ('topics', 'contributions', 'dev_requests')
+
+# SQLite alters columns by rebuilding the table, and the rebuild drops
+# expression indexes and DESC ordering, so these are recreated afterwards
+SQLITE_REBUILT_INDEXES = {
+    'topics': [
+        ('ix_topics_created_by_created', ['created_by', 'created_by_type', sa.text('created_at DESC')]),
+        ('ix_topics_created_at', [sa.text('created_at DESC'), sa.text('id DESC')]),
+    ],
+    'contributions': [
+        ('ix_contributions_author_created', ['author', 'author_type', sa.text('created_at DESC')]),
+        ('ix_contributions_topic_score', ['topic_id', sa.text('(upvotes - downvotes) DESC')]),
+    ],
+}
+
+
+def alter_vote_columns(table: str, **kwargs) -> None:
+    """Alter both vote counters on a table, keeping its indexes intact on SQLite."""
+    with op.batch_alter_table(table) as batch_op:
+        for column in ('upvotes', 'downvotes'):
+            batch_op.alter_column(column, existing_type=sa.Integer(), **kwargs)
+
+    if op.get_context().dialect.name == 'sqlite':
+        for name, columns in SQLITE_REBUILT_INDEXES.get(table, []):
+            op.drop_index(name, table_name=table, if_exists=True)
+            op.create_index(name, table, columns, unique=False)
+
+
+def upgrade() -> None:
+    """Backfill NULL vote counters and make them NOT NULL DEFAULT 0."""
+    for table in VOTE_TABLES:
+        op.execute(f"UPDATE {table} SET upvotes = 0 WHERE upvotes IS NULL")
+        op.execute(f"UPDATE {table} SET downvotes = 0 WHERE downvotes IS NULL")
+        alter_vote_columns(table, nullable=False, server_default='0')
+
+
+def downgrade() -> None:
+    """Make vote counters nullable again."""
+    for table in VOTE_TABLES:
+        alter_vote_columns(table, nullable=True, server_default=None)
@@ -0,0 +1,36 @@
+"""Add created_at index for topic contributions
+
+Revision ID: 015_contribution_created_index
+Revises: 014_vote_counts_not_null
+Create Date: 2026-10-16
+
+This migration adds (topic_id, created_at DESC) on contributions for the
+"new" sort of the topic contributions endpoint and for exports. Together
+with ix_contributions_topic_score it makes the single-column topic_id
+index redundant, so that index is dropped.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '015_contribution_created_index'
+down_revision: Union[str, None] = '014_vote_counts_not_null'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the contribution created_at index and drop the topic_id index."""
+    op.create_index(
+        'ix_contributions_topic_created', 'contributions',
+        ['topic_id', sa.text('created_at DESC')], unique=False
+    )
+    op.drop_index(op.f('ix_contributions_topic_id'), table_name='contributions')
+
+
+def downgrade() -> None:
+    """Restore the topic_id index and drop the created_at index."""
+    op.create_index(op.f('ix_contributions_topic_id'), 'contributions', ['topic_id'], unique=False)
+    op.drop_index('ix_contributions_topic_created', table_name='contributions')
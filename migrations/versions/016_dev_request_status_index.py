@@ -0,0 +1,36 @@
+"""Index dev requests by status and priority
+
+Revision ID: 016_dev_request_status_index
+Revises: 015_contribution_created_index
+Create Date: 2026-10-16
+
+This migration replaces the status index on dev_requests with
+(status, priority). The list endpoints and the pending queue filter on
+status and optionally on priority equality; the composite index serves
+both, so the single-column index from 002 is dropped. priority is a plain
+string, so the index doesn't provide the queue's priority ordering.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '016_dev_request_status_index'
+down_revision: Union[str, None] = '015_contribution_created_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Replace the dev request status index with (status, priority)."""
+    op.create_index(
+        'ix_dev_requests_status_priority', 'dev_requests',
+        ['status', 'priority'], unique=False
+    )
+    op.drop_index(op.f('ix_dev_requests_status'), table_name='dev_requests')
+
+
+def downgrade() -> None:
+    """Restore the single-column status index."""
+    op.create_index(op.f('ix_dev_requests_status'), 'dev_requests', ['status'], unique=False)
+    op.drop_index('ix_dev_requests_status_priority', table_name='dev_requests')
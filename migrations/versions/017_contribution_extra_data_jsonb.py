@@ -0,0 +1,46 @@
+"""Store contribution extra_data as JSONB
+
+Revision ID: 017_contribution_extra_data_jsonb
+Revises: 016_dev_request_status_index
+Create Date: 2026-10-16
+
+This migration converts contributions.extra_data from JSON to JSONB on
+PostgreSQL, matching the document blocks columns (see 006). SQLite has
+no JSONB type, so it is a no-op there. The column is never filtered on,
+so no GIN index is added.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = '017_contribution_extra_data_jsonb'
+down_revision: Union[str, None] = '016_dev_request_status_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Convert contributions.extra_data to JSONB."""
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    op.alter_column(
+        'contributions', 'extra_data',
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        postgresql_using='extra_data::jsonb'
+    )
+
+
+def downgrade() -> None:
+    """Convert contributions.extra_data back to JSON."""
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    op.alter_column(
+        'contributions', 'extra_data',
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        postgresql_using='extra_data::json'
+    )
@@ -0,0 +1,49 @@
+"""Add a primary key to topic_categories
+
+Revision ID: 018_topic_categories_primary_key
+Revises: 017_contribution_extra_data_jsonb
+Create Date: 2026-10-16
+
+This migration adds a (category_name, topic_id) primary key to the
+topic_categories association table, which had no key or index at all.
+Category pages and topic counts look rows up by category_name, so it
+leads the key. Incomplete and duplicate rows are removed first.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '018_topic_categories_primary_key'
+down_revision: Union[str, None] = '017_contribution_extra_data_jsonb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Deduplicate topic_categories and add its primary key."""
+    op.execute("DELETE FROM topic_categories WHERE topic_id IS NULL OR category_name IS NULL")
+
+    # Keep one row per (topic_id, category_name); the table has no id column,
+    # so duplicates are told apart by the physical row id
+    row_id = 'ctid' if op.get_context().dialect.name == 'postgresql' else 'rowid'
+    op.execute(f"""
+        DELETE FROM topic_categories
+        WHERE {row_id} NOT IN (
+            SELECT MIN({row_id}) FROM topic_categories GROUP BY topic_id, category_name
+        )
+    """)
+
+    with op.batch_alter_table('topic_categories') as batch_op:
+        batch_op.alter_column('topic_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('category_name', existing_type=sa.String(), nullable=False)
+        batch_op.create_primary_key('pk_topic_categories', ['category_name', 'topic_id'])
+
+
+def downgrade() -> None:
+    """Drop the topic_categories primary key."""
+    with op.batch_alter_table('topic_categories') as batch_op:
+        batch_op.drop_constraint('pk_topic_categories', type_='primary')
+        batch_op.alter_column('category_name', existing_type=sa.String(), nullable=True)
+        batch_op.alter_column('topic_id', existing_type=sa.Integer(), nullable=True)
@@ -1,20 +1,30 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Table, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Table, Boolean, Index, PrimaryKeyConstraint, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
 
-# Association table for topic categories
+# Binary JSONB on PostgreSQL (no re-parsing on read, supports jsonb operators),
+# plain JSON on SQLite for local development and tests
+JSONBlob = JSON().with_variant(JSONB(), "postgresql")
+
+# Association table for topic categories. The primary key leads with
+# category_name since category pages and counts look rows up by category.
 topic_categories = Table(
     'topic_categories',
     Base.metadata,
-    Column('topic_id', Integer, ForeignKey('topics.id')),
-    Column('category_name', String, ForeignKey('categories.name'))
+    Column('topic_id', Integer, ForeignKey('topics.id'), nullable=False),
+    Column('category_name', String, ForeignKey('categories.name'), nullable=False),
+    PrimaryKeyConstraint('category_name', 'topic_id', name='pk_topic_categories')
 )
 
 
 class Topic(Base):
     """A question or problem that humans and AI collaborate on"""
     __tablename__ = "topics"
+    # Search uses ILIKE on title/description; on PostgreSQL those are served by
+    # pg_trgm GIN indexes created in migration 010 (not declared here, since
+    # create_all can't assume the extension is installed)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     slug = Column(String, unique=True, index=True, nullable=False)
@@ -26,8 +36,13 @@ class Topic(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Voting
-    upvotes = Column(Integer, default=0)
-    downvotes = Column(Integer, default=0)
+    upvotes = Column(Integer, nullable=False, default=0, server_default='0')
+    downvotes = Column(Integer, nullable=False, default=0, server_default='0')
+
+    # Denormalized stats - kept in sync by add_contribution
+    contribution_count = Column(Integer, nullable=False, default=0, server_default='0')
+    # Names of self.categories - set when the topic is created, read without a join
+    category_names = Column(JSONBlob, nullable=False, default=list, server_default='[]')
 
     # Relationships
     contributions = relationship("Contribution", back_populates="topic", order_by="desc(Contribution.created_at)")
@@ -39,7 +54,7 @@ class Contribution(Base):
     __tablename__ = "contributions"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    topic_id = Column(Integer, ForeignKey('topics.id'), nullable=False, index=True)
+    topic_id = Column(Integer, ForeignKey('topics.id'), nullable=False)  # indexed by the composite indexes below
     reply_to = Column(Integer, ForeignKey('contributions.id'), nullable=True, index=True)
 
     # Content
@@ -49,15 +64,15 @@ class Contribution(Base):
     language = Column(String, nullable=True)  # For code: "python", "javascript", etc.
     file_url = Column(String, nullable=True)
     file_name = Column(String, nullable=True)
-    extra_data = Column(JSON, default={})
+    extra_data = Column(JSONBlob, default=dict)
 
     # Attribution
     author = Column(String, nullable=False)
     author_type = Column(String, nullable=False)  # "human" or "agent"
 
     # Voting
-    upvotes = Column(Integer, default=0)
-    downvotes = Column(Integer, default=0)
+    upvotes = Column(Integer, nullable=False, default=0, server_default='0')
+    downvotes = Column(Integer, nullable=False, default=0, server_default='0')
 
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -95,10 +110,17 @@ class User(Base):
 class UserSession(Base):
     """Persistent user sessions"""
     __tablename__ = "user_sessions"
+    __table_args__ = (
+        # Session lookups always filter on is_active, so only index live sessions
+        Index(
+            'ix_user_sessions_token_hash_active', 'token_hash', unique=True,
+            postgresql_where=text('is_active'), sqlite_where=text('is_active')
+        ),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
-    token = Column(String, unique=True, index=True, nullable=False)
+    token_hash = Column(String, nullable=False)  # SHA-256 of the session token, never the token itself
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     expires_at = Column(DateTime(timezone=True), nullable=True)
     is_active = Column(Boolean, default=True)
@@ -122,7 +144,7 @@ class TopicDocument(Base):
     topic_id = Column(Integer, ForeignKey('topics.id'), nullable=False, unique=True, index=True)
 
     # Document content stored as blocks
-    blocks = Column(JSON, default=[])
+    blocks = Column(JSONBlob, default=list)
 
     # Metadata
     version = Column(Integer, default=1)
@@ -138,6 +160,10 @@ class TopicDocument(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    # Fetch server-generated timestamps via RETURNING on INSERT/UPDATE
+    # so writers don't need a refresh() round-trip afterwards
+    __mapper_args__ = {"eager_defaults": True}
+
 
 class DevRequest(Base):
     """Development request for a topic - feature requests, bugs, improvements"""
@@ -165,8 +191,8 @@ class DevRequest(Base):
     requested_by_type = Column(String, nullable=False)
 
     # Voting
-    upvotes = Column(Integer, default=0)
-    downvotes = Column(Integer, default=0)
+    upvotes = Column(Integer, nullable=False, default=0, server_default='0')
+    downvotes = Column(Integer, nullable=False, default=0, server_default='0')
 
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -184,8 +210,9 @@ class TopicDocumentRevision(Base):
     document_id = Column(Integer, ForeignKey('topic_documents.id'), nullable=False, index=True)
     topic_id = Column(Integer, ForeignKey('topics.id'), nullable=False, index=True)
 
-    # Snapshot of blocks at this version
-    blocks = Column(JSON, default=[])
+    # Blocks at this version: a delta against the next version
+    # ({"order": [...], "changed": {...}}), or a full list for older rows
+    blocks = Column(JSONBlob, default=list)
     version = Column(Integer, nullable=False)
 
     # What changed
@@ -196,3 +223,43 @@ class TopicDocumentRevision(Base):
     edited_by_type = Column(String, nullable=False)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+# History lists revisions newest-first; revert looks up a single version
+Index(
+    'ix_topic_document_revisions_document_created',
+    TopicDocumentRevision.document_id, TopicDocumentRevision.created_at.desc()
+)
+Index(
+    'ix_topic_document_revisions_document_version',
+    TopicDocumentRevision.document_id, TopicDocumentRevision.version
+)
+
+# Public profiles list an author's topics and contributions newest-first
+Index(
+    'ix_topics_created_by_created',
+    Topic.created_by, Topic.created_by_type, Topic.created_at.desc()
+)
+Index(
+    'ix_contributions_author_created',
+    Contribution.author, Contribution.author_type, Contribution.created_at.desc()
+)
+
+# A topic's contributions are listed by score by default; indexing the same
+# expression lets the database read them in order instead of sorting
+Index(
+    'ix_contributions_topic_score',
+    Contribution.topic_id, text('(upvotes - downvotes) DESC')
+)
+
+# ...and newest-first for sort=new (exports read the same index backwards)
+Index(
+    'ix_contributions_topic_created',
+    Contribution.topic_id, Contribution.created_at.desc()
+)
+
+# Topic listings default to newest-first, with id breaking ties for the cursor
+Index('ix_topics_created_at', Topic.created_at.desc(), Topic.id.desc())
+
+# Dev request lists filter on status, and optionally on priority as well
+Index('ix_dev_requests_status_priority', DevRequest.status, DevRequest.priority)
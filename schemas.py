@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Literal, Optional, List
 from datetime import datetime
 
 
@@ -30,8 +30,7 @@ class CategoryResponse(BaseModel):
     parent_category: Optional[str]
     topic_count: int = 0
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # === Topic Schemas ===
@@ -39,7 +38,7 @@ class CategoryResponse(BaseModel):
 class TopicCreate(BaseModel):
     title: str = Field(..., min_length=3, max_length=MAX_TITLE_LENGTH)
     description: Optional[str] = Field(None, max_length=MAX_DESCRIPTION_LENGTH)
-    categories: Optional[List[str]] = Field(default=[], max_length=MAX_CATEGORIES)
+    categories: Optional[List[str]] = Field(default_factory=list, max_length=MAX_CATEGORIES)
 
 
 class TopicResponse(BaseModel):
@@ -52,13 +51,12 @@ class TopicResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     contribution_count: int = 0
-    categories: List[str] = []
+    categories: List[str] = Field(default_factory=list)
     upvotes: int = 0
     downvotes: int = 0
     score: int = 0
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TopicListItem(BaseModel):
@@ -72,19 +70,18 @@ class TopicListItem(BaseModel):
     updated_at: datetime
     score: int = 0
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # === Contribution Schemas ===
 
 class ContributionCreate(BaseModel):
-    content_type: str = Field(..., pattern="^(text|code|data|link|document)$")
+    content_type: Literal["text", "code", "data", "link", "document"]
     title: Optional[str] = Field(None, max_length=MAX_TITLE_LENGTH)
     content: Optional[str] = Field(None, max_length=MAX_CONTENT_LENGTH)
     language: Optional[str] = Field(None, max_length=50)  # For code
     file_url: Optional[str] = Field(None, max_length=MAX_URL_LENGTH)
-    extra_data: Optional[dict] = {}
+    extra_data: Optional[dict] = Field(default_factory=dict)
     reply_to: Optional[int] = None  # ID of contribution being replied to
 
 
@@ -107,8 +104,7 @@ class ContributionResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # === User Schemas ===
@@ -135,18 +131,17 @@ class UserResponse(BaseModel):
     karma: int
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # === Document Schemas ===
 
 class DocumentBlock(BaseModel):
     id: str = Field(..., max_length=50)
-    type: str = Field(..., pattern="^(heading|text|code|checklist|link|data|quote)$")
+    type: Literal["heading", "text", "code", "checklist", "link", "data", "quote"]
     content: str = Field(..., max_length=MAX_CONTENT_LENGTH)
     language: Optional[str] = Field(None, max_length=50)  # For code blocks
-    meta: Optional[dict] = {}  # Additional metadata (author, source contribution, etc.)
+    meta: Optional[dict] = Field(default_factory=dict)  # Additional metadata (author, source contribution, etc.)
 
 
 class DocumentCreate(BaseModel):
@@ -156,7 +151,7 @@ class DocumentCreate(BaseModel):
 
 class DocumentEdit(BaseModel):
     block_id: str
-    action: str  # "replace", "delete"
+    action: Literal["replace", "delete"]
     content: Optional[str] = None
     type: Optional[str] = None
     language: Optional[str] = None
@@ -164,17 +159,17 @@ class DocumentEdit(BaseModel):
 
 
 class DocumentInsert(BaseModel):
-    action: str = "insert"
+    action: Literal["insert"] = "insert"
     after: Optional[str] = None  # block_id to insert after, None = beginning
     type: str
     content: str
     language: Optional[str] = None
-    meta: Optional[dict] = {}
+    meta: Optional[dict] = Field(default_factory=dict)
 
 
 class DocumentPatch(BaseModel):
-    edits: Optional[List[DocumentEdit]] = Field(default=[], max_length=100)
-    inserts: Optional[List[DocumentInsert]] = Field(default=[], max_length=100)
+    edits: Optional[List[DocumentEdit]] = Field(default_factory=list, max_length=100)
+    inserts: Optional[List[DocumentInsert]] = Field(default_factory=list, max_length=100)
     edit_summary: Optional[str] = Field(None, max_length=MAX_EDIT_SUMMARY_LENGTH)
 
 
@@ -192,21 +187,19 @@ class DocumentResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DocumentRevisionResponse(BaseModel):
     id: int
     version: int
-    blocks: List[DocumentBlock]
+    blocks: Optional[List[DocumentBlock]] = None  # None when listed with include_blocks=false
     edit_summary: Optional[str]
     edited_by: str
     edited_by_type: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TopicExport(BaseModel):
@@ -219,12 +212,12 @@ class TopicExport(BaseModel):
 class DevRequestCreate(BaseModel):
     title: str = Field(..., min_length=3, max_length=MAX_TITLE_LENGTH)
     description: Optional[str] = Field(None, max_length=MAX_CONTENT_LENGTH)
-    priority: str = Field(default="normal", pattern="^(low|normal|high|critical)$")
-    request_type: str = Field(default="feature", pattern="^(feature|bug|improvement|refactor)$")
+    priority: Literal["low", "normal", "high", "critical"] = "normal"
+    request_type: Literal["feature", "bug", "improvement", "refactor"] = "feature"
 
 
 class DevRequestUpdate(BaseModel):
-    status: Optional[str] = Field(None, pattern="^(pending|in_progress|completed|rejected)$")
+    status: Optional[Literal["pending", "in_progress", "completed", "rejected"]] = None
     implementation_notes: Optional[str] = Field(None, max_length=MAX_CONTENT_LENGTH)
     git_commit: Optional[str] = Field(None, max_length=100)
 
@@ -252,8 +245,7 @@ class DevRequestResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # === Search Schemas ===
@@ -266,5 +258,4 @@ class SearchResult(BaseModel):
     snippet: str
     score: float
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -14,17 +14,19 @@ from typing import Optional
 CLAWCOLLAB_API = "https://clawcollab.com/api/v1"
 CLAWDBOT_API_KEY = "YOUR_CLAWDBOT_API_KEY"  # Get this from agent registration
 
-HEADERS = {
+# One session for all calls so the TLS connection is reused, e.g. while
+# polling task status
+session = requests.Session()
+session.headers.update({
     "Authorization": f"Bearer {CLAWDBOT_API_KEY}",
     "Content-Type": "application/json"
-}
+})
 
 
 def get_top_ideas(limit: int = 5) -> list:
     """Fetch top-voted development ideas from ClawCollab"""
-    response = requests.get(
+    response = session.get(
         f"{CLAWCOLLAB_API}/dev/ideas",
-        headers=HEADERS,
         params={"limit": limit}
     )
     response.raise_for_status()
@@ -33,9 +35,8 @@ def get_top_ideas(limit: int = 5) -> list:
 
 def submit_dev_instruction(instruction: str, context: dict = None) -> str:
     """Submit a development instruction and return task ID"""
-    response = requests.post(
+    response = session.post(
         f"{CLAWCOLLAB_API}/dev/instruct",
-        headers=HEADERS,
         json={
             "instruction": instruction,
             "context": context or {}
@@ -47,10 +48,7 @@ def submit_dev_instruction(instruction: str, context: dict = None) -> str:
 
 def get_task_status(task_id: str) -> dict:
     """Get the status of a development task"""
-    response = requests.get(
-        f"{CLAWCOLLAB_API}/dev/tasks/{task_id}",
-        headers=HEADERS
-    )
+    response = session.get(f"{CLAWCOLLAB_API}/dev/tasks/{task_id}")
     response.raise_for_status()
     return response.json()["task"]
 
@@ -90,9 +88,8 @@ def post_result_as_contribution(topic_slug: str, result: dict) -> None:
 ```
 """
 
-    requests.post(
+    session.post(
         f"{CLAWCOLLAB_API}/topics/{topic_slug}/contribute",
-        headers=HEADERS,
         json={
             "content_type": "text",
             "title": f"Development Update: {result['task_id']}",
@@ -12,13 +12,19 @@ os.environ["TESTING"] = "1"
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import raiseload, sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from database import Base, get_db
+import auth
+from database import Base, get_db, JSON_ENGINE_ARGS
+from cache import clear_all_caches
 from main import app
 
+# Every registration and login hashes a password; the production round count
+# would make that the slowest part of the suite
+auth.PASSWORD_HASH_ITERATIONS = 1
+
 
 # Use in-memory SQLite for tests
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -27,10 +33,23 @@ engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
+    **JSON_ENGINE_ARGS
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@event.listens_for(TestingSessionLocal, "do_orm_execute")
+def raise_on_lazy_load(state):
+    """
+    Fail any test that lazy-loads a relationship.
+
+    Endpoints should select what they need up front; a lazy load per row is
+    an N+1 query, so make it an error instead of a silent slowdown.
+    """
+    if state.is_select and not state.is_column_load and not state.is_relationship_load:
+        state.statement = state.statement.options(raiseload("*"))
+
+
 def override_get_db():
     """Override database dependency for testing."""
     db = TestingSessionLocal()
@@ -40,29 +59,48 @@ def override_get_db():
         db.close()
 
 
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    """Create the tables once for the whole test run."""
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
 @pytest.fixture(scope="function")
 def db():
-    """Create a fresh database for each test."""
-    Base.metadata.create_all(bind=engine)
+    """Give each test an empty database, deleting rows instead of re-running DDL."""
     db = TestingSessionLocal()
     try:
         yield db
     finally:
         db.close()
-        Base.metadata.drop_all(bind=engine)
+        with engine.begin() as conn:
+            for table in reversed(Base.metadata.sorted_tables):
+                conn.execute(table.delete())
+
+
+@pytest.fixture(scope="session")
+def test_client():
+    """
+    One TestClient for the whole run; the app holds no per-test state.
+
+    Entering the client runs the lifespan once and keeps its event loop
+    thread alive, instead of starting a new one for every request.
+    """
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture(scope="function")
-def client(db):
-    """Create a test client with database override."""
+def client(db, test_client):
+    """Return the test client with the database overridden for this test."""
     app.dependency_overrides[get_db] = override_get_db
-    Base.metadata.create_all(bind=engine)
-
-    test_client = TestClient(app)
     yield test_client
 
     app.dependency_overrides.clear()
-    Base.metadata.drop_all(bind=engine)
+    test_client.cookies.clear()
+    clear_all_caches()
 
 
 @pytest.fixture
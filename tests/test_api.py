@@ -61,6 +61,14 @@ class TestAgentRegistration:
         )
         assert response.status_code == 409  # Conflict for duplicates
 
+    def test_register_duplicate_agent_different_case(self, client, registered_agent):
+        """Names that differ only by case should also conflict."""
+        response = client.post(
+            "/api/v1/agents/register",
+            json={"name": registered_agent["name"].upper()}
+        )
+        assert response.status_code == 409
+
     def test_register_agent_invalid_name(self, client):
         """Invalid agent names should be rejected."""
         response = client.post(
@@ -104,6 +112,16 @@ class TestAgentClaim:
         assert data["success"] is True
         assert "already claimed" in data["message"].lower()
 
+    def test_claim_extracts_x_handle(self, client, registered_agent):
+        """Claiming with a tweet URL should record the owner's handle."""
+        claim_token = registered_agent["claim_url"].rsplit("/", 1)[-1]
+        response = client.put(
+            f"/api/v1/agents/claim/{claim_token}",
+            json={"tweet_url": "https://www.x.com/some_owner/status/123?s=20"}
+        )
+        assert response.status_code == 200
+        assert response.json()["agent"]["owner"] == "some_owner"
+
     def test_agent_status(self, client, registered_agent):
         """Agent status endpoint should work."""
         api_key = registered_agent["api_key"]
@@ -134,6 +152,50 @@ class TestUserRegistration:
         assert data["success"] is True
         assert "token" in data  # API uses 'token' not 'session_token'
 
+    def test_session_token_stored_hashed(self, client, db, registered_user, user_auth_headers):
+        """Only a hash of the session token should be persisted."""
+        from models import UserSession
+        from auth import hash_session_token
+
+        session = db.query(UserSession).one()
+        assert session.token_hash == hash_session_token(registered_user["token"])
+        assert session.token_hash != registered_user["token"]
+
+        response = client.get("/api/v1/users/me", headers=user_auth_headers)
+        assert response.status_code == 200
+        assert response.json()["type"] == "human"
+
+    def test_revoked_session_rejected_while_cached(self, client, db, user_auth_headers):
+        """Deactivating a session should take effect even if its token is cached."""
+        from models import UserSession
+
+        assert client.get("/api/v1/users/me", headers=user_auth_headers).status_code == 200
+
+        db.query(UserSession).update({UserSession.is_active: False})
+        db.commit()
+
+        response = client.get("/api/v1/users/me", headers=user_auth_headers)
+        assert response.status_code == 401
+
+    def test_login_user(self, client, registered_user):
+        """Login should return a new session token for valid credentials."""
+        response = client.post(
+            "/api/v1/users/login",
+            json={"email": "test@example.com", "password": "testpassword123"}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert data["token"] != registered_user["token"]
+
+    def test_login_user_wrong_password(self, client, registered_user):
+        """Login with the wrong password should fail."""
+        response = client.post(
+            "/api/v1/users/login",
+            json={"email": "test@example.com", "password": "wrongpassword"}
+        )
+        assert response.status_code == 401
+
     def test_register_user_duplicate_email(self, client, registered_user):
         """Duplicate emails should fail."""
         response = client.post(
@@ -241,6 +303,25 @@ class TestTopics:
         assert isinstance(data, list)
         assert len(data) >= 1
 
+    def test_list_topics_pages_with_cursor(self, client, auth_headers):
+        """after_id should continue the listing where the previous page ended."""
+        for i in range(5):
+            client.post("/api/v1/topics", headers=auth_headers, json={"title": f"Paged Topic {i}"})
+
+        for sort in ("recent", "oldest"):
+            expected = [t["id"] for t in client.get("/api/v1/topics", params={"sort": sort}).json()]
+            first = client.get("/api/v1/topics", params={"sort": sort, "limit": 2}).json()
+            rest = client.get(
+                "/api/v1/topics",
+                params={"sort": sort, "after_id": first[-1]["id"]}
+            ).json()
+            assert [t["id"] for t in first + rest] == expected
+
+    def test_list_topics_unknown_cursor(self, client):
+        """An after_id that matches no topic should be an error, not an empty page."""
+        response = client.get("/api/v1/topics", params={"after_id": 9999})
+        assert response.status_code == 400
+
     def test_get_topic_by_slug(self, client, auth_headers):
         """Get topic by slug should work."""
         # Create a topic
@@ -251,10 +332,102 @@ class TestTopics:
         )
         slug = create_response.json()["slug"]
 
+        client.post(
+            f"/api/v1/topics/{slug}/contribute",
+            headers=auth_headers,
+            json={"content_type": "text", "content": "Counted"}
+        )
+
         response = client.get(f"/api/v1/topics/{slug}")
         assert response.status_code == 200
         data = response.json()
         assert data["slug"] == slug
+        assert data["contribution_count"] == 1
+
+    def test_topic_categories_returned(self, client, auth_headers):
+        """Categories should be included when creating and fetching a topic."""
+        create_response = client.post(
+            "/api/v1/topics",
+            headers=auth_headers,
+            json={"title": "Categorized Topic", "categories": ["science", "math"]}
+        )
+        assert create_response.status_code == 200
+        created = create_response.json()
+        assert sorted(created["categories"]) == ["math", "science"]
+
+        slug = created["slug"]
+        response = client.get(f"/api/v1/topics/{slug}")
+        assert sorted(response.json()["categories"]) == ["math", "science"]
+
+    def test_topic_reuses_existing_categories(self, client, auth_headers):
+        """Existing categories should be reused and duplicate names ignored."""
+        client.post(
+            "/api/v1/topics",
+            headers=auth_headers,
+            json={"title": "First Categorized", "categories": ["science"]}
+        )
+        response = client.post(
+            "/api/v1/topics",
+            headers=auth_headers,
+            json={"title": "Second Categorized", "categories": ["science", "art", "science"]}
+        )
+        assert response.status_code == 200
+        assert response.json()["categories"] == ["science", "art"]
+
+        categories = client.get("/api/v1/categories").json()
+        assert {c["name"]: c["topic_count"] for c in categories} == {"science": 2, "art": 1}
+
+    def test_category_topics_include_new_topics(self, client, auth_headers):
+        """A category's topic list should pick up topics added after it was read."""
+        client.post("/api/v1/topics", headers=auth_headers, json={"title": "First Physics", "categories": ["physics"]})
+        assert len(client.get("/api/v1/category/physics").json()) == 1
+
+        client.post("/api/v1/topics", headers=auth_headers, json={"title": "Second Physics", "categories": ["physics"]})
+        titles = sorted(t["title"] for t in client.get("/api/v1/category/physics").json())
+        assert titles == ["First Physics", "Second Physics"]
+
+        assert client.get("/api/v1/category/missing").status_code == 404
+
+    def test_list_categories_not_modified(self, client, auth_headers):
+        """Categories should return 304 for a matching ETag until a topic joins one."""
+        client.post("/api/v1/topics", headers=auth_headers, json={"title": "Tagged", "categories": ["history"]})
+        etag = client.get("/api/v1/categories").headers["etag"]
+
+        response = client.get("/api/v1/categories", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+        client.post("/api/v1/topics", headers=auth_headers, json={"title": "Tagged Too", "categories": ["history"]})
+        response = client.get("/api/v1/categories", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()[0]["topic_count"] == 2
+
+    def test_create_duplicate_topic(self, client, auth_headers):
+        """Topics whose titles produce an existing slug should conflict."""
+        client.post("/api/v1/topics", headers=auth_headers, json={"title": "Duplicate Topic"})
+        response = client.post("/api/v1/topics", headers=auth_headers, json={"title": "Duplicate topic!"})
+        assert response.status_code == 409
+
+    def test_search_ranks_title_matches_first(self, client, auth_headers):
+        """Search should score in the database and apply the limit after ranking."""
+        client.post(
+            "/api/v1/topics",
+            headers=auth_headers,
+            json={"title": "Unrelated", "description": "mentions widgets and more widgets"}
+        )
+        client.post(
+            "/api/v1/topics",
+            headers=auth_headers,
+            json={"title": "Widgets", "description": "All about widgets"}
+        )
+
+        response = client.get("/api/v1/search", params={"q": "Widgets"})
+        assert response.status_code == 200
+        results = response.json()
+        assert [(r["title"], r["score"]) for r in results] == [("Widgets", 11), ("Unrelated", 2)]
+        assert "widgets" in results[1]["snippet"]
+
+        response = client.get("/api/v1/search", params={"q": "widgets", "limit": 1})
+        assert [r["title"] for r in response.json()] == ["Widgets"]
 
     def test_get_topic_not_found(self, client):
         """Non-existent topic should return 404."""
@@ -347,6 +520,27 @@ class TestContributions:
         assert response.status_code == 200
         data = response.json()
         assert isinstance(data, list)
+        assert len(data) == 1
+        assert data[0]["content"] == "Test"
+
+    def test_list_contributions_top_ties(self, client, auth_headers, topic_slug):
+        """Contributions with equal scores should list newest first."""
+        for content in ("first", "second", "third"):
+            client.post(
+                f"/api/v1/topics/{topic_slug}/contribute",
+                headers=auth_headers,
+                json={"content_type": "text", "content": content}
+            )
+
+        response = client.get(f"/api/v1/topics/{topic_slug}/contributions", params={"sort": "top"})
+        assert response.status_code == 200
+        assert [c["content"] for c in response.json()] == ["third", "second", "first"]
+
+    def test_list_contributions_empty(self, client, topic_slug):
+        """Topics without contributions should stream an empty list."""
+        response = client.get(f"/api/v1/topics/{topic_slug}/contributions")
+        assert response.status_code == 200
+        assert response.json() == []
 
 
 class TestVoting:
@@ -383,6 +577,256 @@ class TestVoting:
         data = response.json()
         assert data["success"] is True
 
+    def test_votes_accumulate(self, client, auth_headers, topic_slug):
+        """Each vote should be applied on top of the previous ones."""
+        for _ in range(2):
+            client.post(f"/api/v1/topics/{topic_slug}/upvote", headers=auth_headers)
+        response = client.post(f"/api/v1/topics/{topic_slug}/downvote", headers=auth_headers)
+        assert response.json()["score"] == 1
+
+        data = client.get(f"/api/v1/topics/{topic_slug}").json()
+        assert data["upvotes"] == 2
+        assert data["downvotes"] == 1
+
+    def test_vote_missing_topic(self, client, auth_headers):
+        """Voting on a topic that doesn't exist should 404."""
+        response = client.post("/api/v1/topics/no-such-topic/upvote", headers=auth_headers)
+        assert response.status_code == 404
+
+
+class TestDocuments:
+    """Topic document tests."""
+
+    @pytest.fixture
+    def topic_slug(self, client, auth_headers):
+        """Create a topic and return its slug."""
+        response = client.post(
+            "/api/v1/topics",
+            headers=auth_headers,
+            json={"title": "Topic for Documents"}
+        )
+        return response.json()["slug"]
+
+    @pytest.fixture
+    def document(self, client, auth_headers, topic_slug):
+        """Create a two-block document and return the response body."""
+        response = client.post(
+            f"/api/v1/topics/{topic_slug}/document",
+            headers=auth_headers,
+            json={"blocks": [
+                {"id": "b_intro", "type": "heading", "content": "Intro"},
+                {"id": "b_body", "type": "text", "content": "Body"}
+            ]}
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    def test_export_topic(self, client, auth_headers):
+        """Export should include topic metadata, categories and contributions."""
+        slug = client.post(
+            "/api/v1/topics",
+            headers=auth_headers,
+            json={"title": "Exported Topic", "categories": ["research"]}
+        ).json()["slug"]
+        client.post(
+            f"/api/v1/topics/{slug}/contribute",
+            headers=auth_headers,
+            json={"content_type": "text", "content": "Exported"}
+        )
+
+        response = client.get(f"/api/v1/topics/{slug}/export")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["topic"]["categories"] == ["research"]
+        assert [c["content"] for c in data["contributions"]] == ["Exported"]
+
+    def test_export_topic_ndjson(self, client, auth_headers):
+        """NDJSON export should stream the topic then one contribution per line."""
+        import json
+
+        slug = client.post(
+            "/api/v1/topics",
+            headers=auth_headers,
+            json={"title": "Streamed Export"}
+        ).json()["slug"]
+        for content in ("first", "second"):
+            client.post(
+                f"/api/v1/topics/{slug}/contribute",
+                headers=auth_headers,
+                json={"content_type": "text", "content": content}
+            )
+
+        response = client.get(f"/api/v1/topics/{slug}/export.ndjson")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines[0]["slug"] == slug
+        assert [c["content"] for c in lines[1:]] == ["first", "second"]
+
+    def test_get_document_not_found(self, client, topic_slug):
+        """Topics without a document should return 404."""
+        response = client.get(f"/api/v1/topics/{topic_slug}/document")
+        assert response.status_code == 404
+
+    def test_get_document(self, client, topic_slug, document):
+        """Created documents should be retrievable."""
+        response = client.get(f"/api/v1/topics/{topic_slug}/document")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["version"] == 1
+        assert [b["id"] for b in data["blocks"]] == ["b_intro", "b_body"]
+
+    def test_edit_document_updates_cached_document(self, client, auth_headers, topic_slug, document):
+        """Edits should be visible on the next GET."""
+        client.get(f"/api/v1/topics/{topic_slug}/document")
+
+        response = client.patch(
+            f"/api/v1/topics/{topic_slug}/document",
+            headers=auth_headers,
+            json={
+                "edits": [{"block_id": "b_body", "action": "replace", "content": "New body"}],
+                "inserts": [{"after": "b_intro", "type": "text", "content": "Inserted"}]
+            }
+        )
+        assert response.status_code == 200
+
+        data = client.get(f"/api/v1/topics/{topic_slug}/document").json()
+        assert data["version"] == 2
+        assert [b["content"] for b in data["blocks"]] == ["Intro", "Inserted", "New body"]
+
+    def test_concurrent_document_create(self, client, auth_headers, topic_slug, document, monkeypatch):
+        """Losing a race to create the first document should be a 409, not a 500."""
+        import main
+
+        # Replay the loser's view: the lock query ran before the winner committed
+        get_topic_with_document = main.get_topic_with_document
+        monkeypatch.setattr(
+            main, "get_topic_with_document",
+            lambda db, slug, for_update=False: (get_topic_with_document(db, slug)[0], None)
+        )
+
+        response = client.post(
+            f"/api/v1/topics/{topic_slug}/document",
+            headers=auth_headers,
+            json={"blocks": [{"id": "b_second", "type": "text", "content": "Second"}]}
+        )
+        assert response.status_code == 409
+
+    def test_edit_document_unknown_action(self, client, auth_headers, topic_slug, document):
+        """Edits with an unknown action should be rejected, not ignored."""
+        response = client.patch(
+            f"/api/v1/topics/{topic_slug}/document",
+            headers=auth_headers,
+            json={"edits": [{"block_id": "b_body", "action": "move"}]}
+        )
+        assert response.status_code == 422
+
+    def test_get_document_not_modified(self, client, auth_headers, topic_slug, document):
+        """Reads with a current ETag should get a 304 until the document changes."""
+        url = f"/api/v1/topics/{topic_slug}/document"
+        etag = client.get(url).headers["etag"]
+
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+        client.patch(
+            url,
+            headers=auth_headers,
+            json={"edits": [{"block_id": "b_body", "action": "replace", "content": "Changed"}]}
+        )
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    def test_noop_edit_keeps_version(self, client, auth_headers, topic_slug, document):
+        """Edits that change nothing should not bump the version or add a revision."""
+        for edit in ({}, {"edits": [{"block_id": "b_body", "action": "replace", "content": "Body"}]}):
+            response = client.patch(
+                f"/api/v1/topics/{topic_slug}/document",
+                headers=auth_headers,
+                json=edit
+            )
+            assert response.status_code == 200
+            assert response.json()["version"] == 1
+
+        history = client.get(f"/api/v1/topics/{topic_slug}/document/history").json()
+        assert history == []
+
+    def test_revert_document(self, client, auth_headers, topic_slug, document):
+        """Reverting should restore the blocks of an earlier version."""
+        client.patch(
+            f"/api/v1/topics/{topic_slug}/document",
+            headers=auth_headers,
+            json={"edits": [{"block_id": "b_body", "action": "delete"}]}
+        )
+        client.get(f"/api/v1/topics/{topic_slug}/document")
+
+        response = client.post(
+            f"/api/v1/topics/{topic_slug}/document/revert/1",
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+
+        data = client.get(f"/api/v1/topics/{topic_slug}/document").json()
+        assert data["version"] == 3
+        assert [b["id"] for b in data["blocks"]] == ["b_intro", "b_body"]
+
+        history = client.get(f"/api/v1/topics/{topic_slug}/document/history").json()
+        assert sorted(r["version"] for r in history) == [1, 2]
+
+    def test_document_history_rebuilds_blocks(self, client, auth_headers, topic_slug, document):
+        """History should return the full blocks of every earlier version."""
+        edits = [
+            {"edits": [{"block_id": "b_body", "action": "replace", "content": "Body v2"}]},
+            {"inserts": [{"after": "b_body", "type": "text", "content": "Footer"}]},
+            {"edits": [{"block_id": "b_intro", "action": "delete"}]},
+        ]
+        for edit in edits:
+            response = client.patch(
+                f"/api/v1/topics/{topic_slug}/document",
+                headers=auth_headers,
+                json=edit
+            )
+            assert response.status_code == 200
+
+        history = client.get(f"/api/v1/topics/{topic_slug}/document/history").json()
+        contents = {r["version"]: [b["content"] for b in r["blocks"]] for r in history}
+        assert contents == {
+            1: ["Intro", "Body"],
+            2: ["Intro", "Body v2"],
+            3: ["Intro", "Body v2", "Footer"],
+        }
+
+        response = client.post(
+            f"/api/v1/topics/{topic_slug}/document/revert/2",
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        data = client.get(f"/api/v1/topics/{topic_slug}/document").json()
+        assert [b["content"] for b in data["blocks"]] == ["Intro", "Body v2"]
+
+    def test_document_history_without_blocks(self, client, auth_headers, topic_slug, document):
+        """History can list versions without content and fetch one version in full."""
+        client.patch(
+            f"/api/v1/topics/{topic_slug}/document",
+            headers=auth_headers,
+            json={"edits": [{"block_id": "b_body", "action": "replace", "content": "Body v2"}]}
+        )
+
+        history = client.get(
+            f"/api/v1/topics/{topic_slug}/document/history",
+            params={"include_blocks": "false"}
+        ).json()
+        assert [(r["version"], r["blocks"]) for r in history] == [(1, None)]
+
+        response = client.get(f"/api/v1/topics/{topic_slug}/document/history/1")
+        assert response.status_code == 200
+        assert [b["content"] for b in response.json()["blocks"]] == ["Intro", "Body"]
+
+        response = client.get(f"/api/v1/topics/{topic_slug}/document/history/5")
+        assert response.status_code == 404
+
 
 class TestSecurity:
     """Security-related tests."""
@@ -427,3 +871,62 @@ class TestRateLimiting:
         response = client.get("/")
         # Rate limiting is applied, headers may vary
         assert response.status_code == 200
+
+
+class TestProfiles:
+    """Public profile tests."""
+
+    def test_user_profile_truncates_contribution_preview(self, client, user_auth_headers, registered_user):
+        """Profile contributions should only include a short content preview."""
+        slug = client.post(
+            "/api/v1/topics",
+            headers=user_auth_headers,
+            json={"title": "Profile Topic"}
+        ).json()["slug"]
+        client.post(
+            f"/api/v1/topics/{slug}/contribute",
+            headers=user_auth_headers,
+            json={"content_type": "text", "content": "x" * 500}
+        )
+
+        response = client.get(f"/api/v1/users/{registered_user['user']['username']}")
+        assert response.status_code == 200
+        contribution = response.json()["contributions"][0]
+        assert contribution["content"] == "x" * 200 + "..."
+        assert contribution["topic_slug"] == slug
+
+
+class TestDevRequests:
+    """Development request tests."""
+
+    def test_dev_request_lists_include_topic(self, client, auth_headers):
+        """Every dev request read endpoint should include the topic slug and title."""
+        slug = client.post(
+            "/api/v1/topics",
+            headers=auth_headers,
+            json={"title": "Topic With Requests"}
+        ).json()["slug"]
+        response = client.post(
+            f"/api/v1/topics/{slug}/dev-requests",
+            headers=auth_headers,
+            json={"title": "Add dark mode", "priority": "high"}
+        )
+        assert response.status_code == 200
+        request_id = response.json()["id"]
+
+        for url in (
+            f"/api/v1/topics/{slug}/dev-requests",
+            "/api/v1/dev-requests",
+            f"/api/v1/dev-requests?topic_slug={slug}",
+            "/api/v1/dev-requests/pending",
+        ):
+            data = client.get(url).json()
+            assert [(r["id"], r["topic_slug"], r["topic_title"]) for r in data] == [
+                (request_id, slug, "Topic With Requests")
+            ]
+
+        data = client.get(f"/api/v1/dev-requests/{request_id}").json()
+        assert data["topic_slug"] == slug
+        assert data["score"] == 0
+
+        assert client.get("/api/v1/dev-requests?topic_slug=missing").json() == []